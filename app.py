@@ -1,8 +1,12 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-import sqlite3
 import os
+import sys
+import threading
+import streamlit as st
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from perf import recent, span
+from dashboard import pages
+from dashboard.loaders import start_metrics
 
 # Page configuration
 st.set_page_config(
@@ -11,159 +15,51 @@ st.set_page_config(
     layout="wide"
 )
 
-# Database connection
+# Pages live in dashboard/pages and are imported on first visit, so the first paint
+# only pays for streamlit and the page on screen; plotly and pandas come in with the
+# pages that draw charts and tables.
+
+# Once per process, after the first page is on screen, a background thread imports the
+# remaining pages and prefetches what each shows first into the result cache, so the
+# next click skips both the imports and the cold queries. PHONEPE_WARMUP=0 disables it.
 @st.cache_resource
-def get_database_connection():
-    # Use SQLite database
-    db_path = 'phonepe_data.db'
-    if not os.path.exists(db_path):
-        st.error(f"Database file '{db_path}' not found!")
+def start_warmup():
+    if os.environ.get('PHONEPE_WARMUP') == '0':
         return None
-    conn = sqlite3.connect(db_path, check_same_thread=False)
-    return conn
-
-# Load data
-@st.cache_data
-def load_transaction_data():
-    conn = get_database_connection()
-    query = "SELECT * FROM aggregated_transaction"
-    df = pd.read_sql(query, conn)
-    return df
+    from streamlit.runtime.scriptrunner import add_script_run_ctx
+    thread = threading.Thread(target=pages.warm_all, name='dashboard-warmup', daemon=True)
+    add_script_run_ctx(thread)
+    thread.start()
+    return thread
 
-@st.cache_data
-def load_user_data():
-    conn = get_database_connection()
-    query = "SELECT * FROM aggregated_user"
-    df = pd.read_sql(query, conn)
-    return df
-
-# Main app
 def main():
     st.title("📱 PhonePe Pulse Data Visualization Dashboard")
     st.markdown("---")
     
     # Sidebar
     st.sidebar.title("Navigation")
-    page = st.sidebar.radio("Select Page", ["Overview", "Transactions", "Users"])
+    page = st.sidebar.radio("Select Page", list(pages.PAGES))
     
-    if page == "Overview":
-        show_overview()
-    elif page == "Transactions":
-        show_transactions()
-    elif page == "Users":
-        show_users()
-
-def show_overview():
-    st.header("📊 Overview")
+    start_metrics()
     
-    col1, col2 = st.columns(2)
+    with span(f"page.{page.lower()}"):
+        pages.render(page)
     
-    with col1:
-        try:
-            df_trans = load_transaction_data()
-            total_transactions = df_trans['Transaction_count'].sum()
-            total_amount = df_trans['Transaction_amount'].sum()
-            
-            st.metric("Total Transactions", f"{total_transactions:,}")
-            st.metric("Total Transaction Amount", f"₹{total_amount/1e9:.2f}B")
-        except Exception as e:
-            st.error(f"Error loading transaction data: {e}")
+    # Hidden perf panel: open the app with ?perf=1 (or set PHONEPE_PERF_PANEL=1)
+    if st.query_params.get('perf') == '1' or os.environ.get('PHONEPE_PERF_PANEL') == '1':
+        show_perf_panel()
     
-    with col2:
-        try:
-            df_users = load_user_data()
-            total_users = df_users['Transaction_count'].sum()
-            
-            st.metric("Total User Records", f"{len(df_users):,}")
-            st.metric("Total Device Count", f"{total_users:,}")
-        except Exception as e:
-            st.error(f"Error loading user data: {e}")
+    start_warmup()
 
-def show_transactions():
-    st.header("💳 Transaction Analysis")
-    
-    try:
-        df = load_transaction_data()
-        
-        # Filters
-        col1, col2 = st.columns(2)
-        with col1:
-            selected_year = st.selectbox("Select Year", sorted(df['Year'].unique()))
-        with col2:
-            selected_quarter = st.selectbox("Select Quarter", sorted(df['Quarter'].unique()))
-        
-        # Filter data
-        filtered_df = df[(df['Year'] == selected_year) & (df['Quarter'] == selected_quarter)]
-        
-        # Transaction by Type
-        st.subheader("Transactions by Type")
-        trans_by_type = filtered_df.groupby('Transaction_type').agg({
-            'Transaction_count': 'sum',
-            'Transaction_amount': 'sum'
-        }).reset_index()
-        
-        fig = px.bar(trans_by_type, 
-                     x='Transaction_type', 
-                     y='Transaction_amount',
-                     title=f"Transaction Amount by Type (Q{selected_quarter} {selected_year})")
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Top States
-        st.subheader("Top 10 States by Transaction Amount")
-        top_states = filtered_df.groupby('State')['Transaction_amount'].sum().sort_values(ascending=False).head(10)
-        
-        fig2 = px.bar(top_states, 
-                      orientation='h',
-                      title=f"Top 10 States (Q{selected_quarter} {selected_year})")
-        st.plotly_chart(fig2, use_container_width=True)
-        
-        # Data table
-        st.subheader("Transaction Data")
-        st.dataframe(filtered_df, use_container_width=True)
-        
-    except Exception as e:
-        st.error(f"Error: {e}")
-
-def show_users():
-    st.header("👥 User Analysis")
-    
-    try:
-        df = load_user_data()
-        
-        # Filters
-        col1, col2 = st.columns(2)
-        with col1:
-            selected_year = st.selectbox("Select Year", sorted(df['Year'].unique()))
-        with col2:
-            selected_quarter = st.selectbox("Select Quarter", sorted(df['Quarter'].unique()))
-        
-        # Filter data
-        filtered_df = df[(df['Year'] == selected_year) & (df['Quarter'] == selected_quarter)]
-        
-        # Top Brands
-        st.subheader("Top Mobile Brands")
-        brand_data = filtered_df.groupby('Brands')['Transaction_count'].sum().sort_values(ascending=False).head(10)
-        
-        fig = px.pie(values=brand_data.values, 
-                     names=brand_data.index,
-                     title=f"Top 10 Mobile Brands (Q{selected_quarter} {selected_year})")
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # State-wise Users
-        st.subheader("State-wise User Distribution")
-        state_users = filtered_df.groupby('State')['Transaction_count'].sum().sort_values(ascending=False).head(10)
-        
-        fig2 = px.bar(state_users,
-                      orientation='h',
-                      title=f"Top 10 States by Users (Q{selected_quarter} {selected_year})")
-        st.plotly_chart(fig2, use_container_width=True)
-        
-        # Data table
-        st.subheader("User Data")
-        st.dataframe(filtered_df, use_container_width=True)
-        
-    except Exception as e:
-        st.error(f"Error: {e}")
+def show_perf_panel():
+    import pandas as pd
+    with st.sidebar.expander("⏱️ Perf", expanded=True):
+        spans = pd.DataFrame(recent(50))
+        if spans.empty:
+            st.caption("No spans recorded yet")
+        else:
+            columns = [column for column in ['span', 'seconds', 'rows', 'peak_rss_mb', 'peak_growth_mb'] if column in spans]
+            st.dataframe(spans[columns], use_container_width=True, hide_index=True)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
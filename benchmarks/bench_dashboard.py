@@ -0,0 +1,197 @@
+"""Headless load test of the dashboard data layer
+
+Replays random sessions of page visits and Year/Quarter selections (the same queries
+the dashboard pages run for Overview, Transactions, Users and the trends) from many
+threads in many processes, then reports p50/p95/p99 latency and throughput per page as JSON.
+
+    python benchmarks/bench_dashboard.py --db phonepe_data.db --processes 4 --threads 8
+    python benchmarks/bench_dashboard.py --synthetic-states 200 --years 2018-2030
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import threading
+from pathlib import Path
+from multiprocessing import Pool
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src'))
+from dashboard import queries
+from dashboard.pool import ReadOnlyPool
+from ingestion import DATASETS, DirectorySource, IngestionEngine
+from sqlite_store import build_database, new_version
+from synthetic_pulse import generate_tree, parse_years
+
+PAGES = ['Overview', 'Transactions', 'Users', 'Trends']
+
+
+def load_page(conn, table, year, quarter, rng):
+    """Same call components.paged_table makes: one sorted keyset page, sometimes the next one"""
+    sort = rng.choice(queries.TABLES[table]['measures'])
+    df, after = queries.page(conn, table, year, quarter, sort, True, limit=50)
+    if after is not None and rng.random() < 0.3:
+        queries.page(conn, table, year, quarter, sort, True, after=after, limit=50)
+    queries.count(conn, table, year, quarter)
+
+
+def render(conn, page, year, quarter, rng):
+    """Run every data-layer call one page render makes"""
+    if page == 'Overview':
+        queries.cube_totals(conn, 'aggregated_transaction')
+        queries.cube_totals(conn, 'aggregated_user')
+    elif page == 'Transactions':
+        queries.periods(conn, 'aggregated_transaction')
+        queries.cube(conn, 'aggregated_transaction', 'Transaction_type', year, quarter)
+        queries.top_n(conn, 'aggregated_transaction', 'Transaction_amount', 'State', year, quarter)
+        load_page(conn, 'aggregated_transaction', year, quarter, rng)
+    elif page == 'Trends':
+        queries.series(conn, 'aggregated_transaction', 'Transaction_amount')
+        ranking = queries.movers(conn, 'aggregated_transaction', 'Transaction_amount', 'State', limit=1000)
+        queries.series(conn, 'aggregated_transaction', 'Transaction_amount', 'State',
+                       ranking['State'].head(5).tolist())
+    else:
+        queries.periods(conn, 'aggregated_user')
+        queries.top_n(conn, 'aggregated_user', 'Transaction_count', 'Brands', year, quarter)
+        queries.top_n(conn, 'aggregated_user', 'Transaction_count', 'State', year, quarter)
+        load_page(conn, 'aggregated_user', year, quarter, rng)
+
+
+def session(rng, periods, length):
+    """A realistic visit: mostly page switches and period changes, some repeats"""
+    page, (year, quarter) = 'Overview', rng.choice(periods)
+    steps = []
+    for _ in range(length):
+        roll = rng.random()
+        if roll < 0.3:
+            page = rng.choice(PAGES)
+        elif roll < 0.8:
+            year, quarter = rng.choice(periods)
+        steps.append((page, year, quarter))
+    return steps
+
+
+def worker(args):
+    """One process: `threads` threads each replaying `sessions` sessions"""
+    db_path, threads, sessions, length, seed = args
+    pool = ReadOnlyPool(db_path, size=threads)
+    with pool.connection() as conn:
+        periods = [tuple(map(int, p)) for p in queries.periods(conn, 'aggregated_transaction').values]
+
+    samples = []
+    lock = threading.Lock()
+
+    def replay(thread_seed):
+        rng = random.Random(thread_seed)
+        local = []
+        for _ in range(sessions):
+            for page, year, quarter in session(rng, periods, length):
+                started = time.perf_counter()
+                with pool.connection() as conn:
+                    render(conn, page, year, quarter, rng)
+                local.append((page, time.perf_counter() - started))
+        with lock:
+            samples.extend(local)
+
+    runners = [threading.Thread(target=replay, args=(seed * 1000 + t,)) for t in range(threads)]
+    for thread in runners:
+        thread.start()
+    for thread in runners:
+        thread.join()
+    return samples
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, wall_seconds):
+    """Per-page latency percentiles (ms) and throughput (renders/s)"""
+    summary = {}
+    for page in PAGES + ['all']:
+        latencies = sorted(seconds for name, seconds in samples if page in ('all', name))
+        if not latencies:
+            continue
+        summary[page] = {
+            'renders': len(latencies),
+            'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+            'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+            'throughput_per_s': round(len(latencies) / wall_seconds, 1),
+        }
+    return summary
+
+
+def build_synthetic_db(scratch, states, districts, pincodes, years):
+    """Generate a synthetic tree and build a dashboard database from it"""
+    generate_tree(scratch, states, districts, pincodes, years)
+    engine = IngestionEngine(DirectorySource(Path(scratch) / 'pulse-master' / 'data'))
+
+    db_path = Path(scratch) / 'phonepe_data.db'
+    build_database(db_path, engine.iter_batches(list(DATASETS)), new_version())
+    return db_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default=str(ROOT / 'phonepe_data.db'))
+    parser.add_argument('--synthetic-states', type=int, help="build and test a synthetic database instead")
+    parser.add_argument('--districts', type=int, default=20)
+    parser.add_argument('--pincodes', type=int, default=10)
+    parser.add_argument('--years', type=parse_years, default=range(2018, 2025))
+    parser.add_argument('--processes', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=4, help="threads per process")
+    parser.add_argument('--sessions', type=int, default=20, help="sessions per thread")
+    parser.add_argument('--session-length', type=int, default=10, help="renders per session")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="also write the JSON results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='pulse-dash-bench-') as scratch:
+        db_path = Path(args.db)
+        if args.synthetic_states:
+            print(f"Building synthetic database in {scratch}...", file=sys.stderr)
+            db_path = build_synthetic_db(scratch, args.synthetic_states, args.districts,
+                                         args.pincodes, args.years)
+
+        jobs = [(str(db_path), args.threads, args.sessions, args.session_length, args.seed + p)
+                for p in range(args.processes)]
+        print(f"Replaying {args.processes} x {args.threads} x {args.sessions} sessions...", file=sys.stderr)
+        started = time.perf_counter()
+        if args.processes == 1:
+            samples = worker(jobs[0])
+        else:
+            with Pool(args.processes) as pool:
+                samples = [sample for result in pool.map(worker, jobs) for sample in result]
+        wall = time.perf_counter() - started
+
+    report = {
+        'benchmark': 'dashboard',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'params': {
+            'db': None if args.synthetic_states else args.db,
+            'synthetic_states': args.synthetic_states,
+            'processes': args.processes,
+            'threads': args.threads,
+            'sessions': args.sessions,
+            'session_length': args.session_length,
+        },
+        'wall_seconds': round(wall, 3),
+        'pages': summarize(samples, wall),
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
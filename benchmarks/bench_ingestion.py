@@ -0,0 +1,164 @@
+"""Time each ingestion stage (walk, parse, transform, load) and emit JSON results
+
+    python benchmarks/bench_ingestion.py --states 72 --years 2018-2030 --workers 4 --output bench.json
+    python benchmarks/bench_ingestion.py --data-root Data/pulse-master/data
+    python benchmarks/bench_ingestion.py --years 2018-2040 --streaming
+
+Without --data-root a synthetic tree is generated in a temporary directory first.
+PHONEPE_JSON_DECODER=json compares against the stdlib decoder.
+--streaming times the batched pipeline end to end instead; its peak RSS should stay
+flat as --years grows.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+from ingestion import DATASETS, DECODER, ArchiveSource, DirectorySource, IngestionEngine, to_frame
+from sqlite_store import build_database
+from synthetic_pulse import generate_tree, parse_years
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process and of finished pool workers, in MB"""
+    scale = 1 if platform.system() == 'Darwin' else 1024  # ru_maxrss is bytes on macOS, KiB on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+    return round(own / 2**20, 1), round(children / 2**20, 1)
+
+
+def stage(results, name, started, files=None, rows=None):
+    """Record one stage's wall time, throughput and peak RSS"""
+    seconds = time.perf_counter() - started
+    own, children = peak_rss_mb()
+    entry = {'stage': name, 'seconds': round(seconds, 4), 'peak_rss_mb': own, 'peak_worker_rss_mb': children}
+    if files is not None:
+        entry['files'] = files
+        entry['files_per_s'] = round(files / seconds, 1) if seconds else None
+    if rows is not None:
+        entry['rows'] = rows
+        entry['rows_per_s'] = round(rows / seconds, 1) if seconds else None
+    results.append(entry)
+    print(f"  {name:<10} {seconds:8.3f}s", file=sys.stderr)
+
+
+def run(source, workers, db_path):
+    """Run the SQLite build pipeline stage by stage"""
+    engine = IngestionEngine(source, workers=workers)
+    results = []
+
+    started = time.perf_counter()
+    tasks = [task for dataset in DATASETS for task in engine.tasks(dataset)]
+    stage(results, 'walk', started, files=len(tasks))
+
+    started = time.perf_counter()
+    parsed = engine.parse_tasks(tasks)
+    row_count = sum(len(file_rows) for file_rows in parsed)
+    stage(results, 'parse', started, files=len(tasks), rows=row_count)
+
+    started = time.perf_counter()
+    tables = {dataset: [] for dataset in DATASETS}
+    for task, file_rows in zip(tasks, parsed):
+        tables[task[0]].extend(file_rows)
+    frames = {dataset: to_frame(dataset, rows) for dataset, rows in tables.items()}
+    stage(results, 'transform', started, rows=sum(len(df) for df in frames.values()))
+    del frames
+
+    started = time.perf_counter()
+    build_database(db_path, tables)
+    stage(results, 'load', started, rows=row_count)
+
+    results.append(totals(results, len(tasks), row_count))
+    return results
+
+
+def run_streaming(source, workers, db_path, batch_size):
+    """Run the streamed pipeline (walk, parse and load overlap) as one stage"""
+    engine = IngestionEngine(source, workers=workers)
+    results = []
+
+    started = time.perf_counter()
+    files = sum(len(engine.tasks(dataset)) for dataset in DATASETS)
+    counts = build_database(db_path, engine.iter_batches(list(DATASETS), batch_size))
+    row_count = sum(counts.values())
+    stage(results, 'stream', started, files=files, rows=row_count)
+
+    results.append(totals(results, files, row_count))
+    return results
+
+
+def totals(results, files, row_count):
+    """Summary entry over all stages"""
+    total = sum(entry['seconds'] for entry in results)
+    return {
+        'stage': 'total',
+        'seconds': round(total, 4),
+        'files': files,
+        'files_per_s': round(files / total, 1) if total else None,
+        'rows': row_count,
+        'rows_per_s': round(row_count / total, 1) if total else None,
+        'peak_rss_mb': peak_rss_mb()[0],
+        'peak_worker_rss_mb': peak_rss_mb()[1],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data-root', help="existing pulse-master/data directory (skips generation)")
+    parser.add_argument('--archive', help="ingest from a Pulse zip instead of a directory")
+    parser.add_argument('--states', type=int, default=36)
+    parser.add_argument('--districts', type=int, default=20)
+    parser.add_argument('--pincodes', type=int, default=10)
+    parser.add_argument('--years', type=parse_years, default=range(2018, 2025))
+    parser.add_argument('--workers', type=int, default=None, help="default: all cores")
+    parser.add_argument('--streaming', action='store_true', help="time the batched pipeline end to end")
+    parser.add_argument('--batch-size', type=int, default=50000, help="rows per batch with --streaming")
+    parser.add_argument('--output', help="also write the JSON results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='pulse-bench-') as scratch:
+        if args.archive:
+            source = ArchiveSource(args.archive)
+        elif args.data_root:
+            source = DirectorySource(args.data_root)
+        else:
+            print(f"Generating synthetic tree in {scratch}...", file=sys.stderr)
+            generate_tree(scratch, args.states, args.districts, args.pincodes, args.years)
+            source = DirectorySource(Path(scratch) / 'pulse-master' / 'data')
+
+        print("Running ingestion stages...", file=sys.stderr)
+        if args.streaming:
+            stages = run_streaming(source, args.workers, Path(scratch) / 'bench.db', args.batch_size)
+        else:
+            stages = run(source, args.workers, Path(scratch) / 'bench.db')
+        db_mb = round((Path(scratch) / 'bench.db').stat().st_size / 2**20, 2)
+
+    report = {
+        'benchmark': 'ingestion',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'workers': args.workers or os.cpu_count(),
+        'mode': 'streaming' if args.streaming else 'staged',
+        'decoder': DECODER,
+        'params': {
+            'data_root': args.data_root,
+            'archive': args.archive,
+            'states': args.states,
+            'districts': args.districts,
+            'pincodes': args.pincodes,
+            'years': [args.years[0], args.years[-1]],
+        },
+        'stages': stages,
+        'db_mb': db_mb,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
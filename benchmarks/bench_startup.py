@@ -0,0 +1,112 @@
+"""Import-time budget for the dashboard's first paint
+
+Times, in fresh interpreters, what app.py imports before the first page is on screen
+(the shell plus the default Overview page) on top of streamlit itself, then the import
+of every other page, and reports which heavy libraries each step pulls in. Exits
+non-zero when the shell goes over --budget-ms or loads one of the deferred libraries.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --budget-ms 100 --repeat 9 --output startup.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Libraries the shell must not import (beyond what streamlit itself loads); pages that
+# need them load them on demand
+DEFERRED = ['pandas', 'plotly', 'plotly.express', 'numpy', 'pyarrow']
+
+# Runs in a fresh interpreter per sample, so nothing is already in sys.modules
+PROBE = """
+import sys, json, time
+sys.path[:0] = {paths!r}
+started = time.perf_counter()
+import streamlit
+streamlit_done = time.perf_counter()
+preloaded = set(sys.modules)
+from perf import span
+from dashboard import pages
+import dashboard.loaders
+pages.load('Overview')
+shell_done = time.perf_counter()
+shell_modules = [name for name in {deferred!r} if name in sys.modules and name not in preloaded]
+pages.load({page!r})
+page_done = time.perf_counter()
+print(json.dumps({{
+    'streamlit_ms': (streamlit_done - started) * 1000,
+    'shell_ms': (shell_done - streamlit_done) * 1000,
+    'page_ms': (page_done - shell_done) * 1000,
+    'shell_modules': shell_modules,
+    'page_modules': [name for name in {deferred!r} if name in sys.modules and name not in preloaded],
+}}))
+"""
+
+
+def probe(page):
+    """One cold-start sample for page"""
+    code = PROBE.format(paths=[str(ROOT), str(ROOT / 'src')], deferred=DEFERRED, page=page)
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(page, repeat):
+    """Median timings of `repeat` cold starts that end on page"""
+    samples = [probe(page) for _ in range(repeat)]
+    return {
+        **{key: round(statistics.median(sample[key] for sample in samples), 1)
+           for key in ('streamlit_ms', 'shell_ms', 'page_ms')},
+        'shell_modules': samples[-1]['shell_modules'],
+        'page_modules': samples[-1]['page_modules'],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=150.0,
+                        help="maximum median import time of the shell on top of streamlit")
+    parser.add_argument('--repeat', type=int, default=5, help="cold starts per measurement")
+    parser.add_argument('--output', help="also write the JSON results to this file")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    from dashboard.pages import PAGES
+
+    print(f"Timing {len(PAGES)} pages x {args.repeat} cold starts...", file=sys.stderr)
+    pages = {page: measure(page, args.repeat) for page in PAGES}
+    first = pages['Overview']
+
+    failures = []
+    if first['shell_ms'] > args.budget_ms:
+        failures.append(f"shell import took {first['shell_ms']}ms, budget {args.budget_ms}ms")
+    if first['shell_modules']:
+        failures.append(f"shell imported deferred libraries: {', '.join(first['shell_modules'])}")
+
+    report = {
+        'benchmark': 'startup',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'params': {'budget_ms': args.budget_ms, 'repeat': args.repeat},
+        'streamlit_ms': first['streamlit_ms'],
+        'shell_ms': first['shell_ms'],
+        'shell_modules': first['shell_modules'],
+        'pages': {page: {'import_ms': result['page_ms'], 'modules': result['page_modules']}
+                  for page, result in pages.items()},
+        'within_budget': not failures,
+        'failures': failures,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    for failure in failures:
+        print(f"❌ {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,122 @@
+"""Generate synthetic pulse-master/data trees with the real PhonePe Pulse JSON shapes
+
+    python benchmarks/synthetic_pulse.py /tmp/pulse --states 72 --districts 40 --pincodes 50 --years 2018-2030
+"""
+import json
+import random
+import argparse
+from pathlib import Path
+
+TRANSACTION_TYPES = ['Recharge & bill payments', 'Peer-to-peer payments', 'Merchant payments',
+                     'Financial Services', 'Others']
+BRANDS = ['Xiaomi', 'Samsung', 'Vivo', 'Oppo', 'Realme', 'Apple', 'Motorola', 'OnePlus',
+          'Huawei', 'Infinix', 'Tecno', 'Others']
+
+
+def envelope(data):
+    return {'success': True, 'code': 'SUCCESS', 'data': data, 'responseTimestamp': 1692610801655}
+
+
+def metric(rng, scale):
+    count = rng.randint(1, scale)
+    return {'type': 'TOTAL', 'count': count, 'amount': count * rng.uniform(50, 5000)}
+
+
+def aggregated_transaction(rng, names, scale):
+    return envelope({'from': 0, 'to': 0, 'transactionData': [
+        {'name': name, 'paymentInstruments': [metric(rng, scale)]} for name in names
+    ]})
+
+
+def aggregated_user(rng):
+    counts = [rng.randint(1000, 5000000) for _ in BRANDS]
+    total = sum(counts)
+    return envelope({
+        'aggregated': {'registeredUsers': total, 'appOpens': total * rng.randint(1, 30)},
+        'usersByDevice': [
+            {'brand': brand, 'count': count, 'percentage': count / total}
+            for brand, count in zip(BRANDS, counts)
+        ],
+    })
+
+
+def map_transaction(rng, districts, scale):
+    return envelope({'hoverDataList': [
+        {'name': district, 'metric': [metric(rng, scale)]} for district in districts
+    ]})
+
+
+def map_user(rng, districts):
+    return envelope({'hoverData': {
+        district: {'registeredUsers': rng.randint(100, 3000000), 'appOpens': rng.randint(0, 90000000)}
+        for district in districts
+    }})
+
+
+def top_transaction(rng, districts, pincodes, scale):
+    return envelope({
+        'states': None,
+        'districts': [{'entityName': name, 'metric': metric(rng, scale)} for name in districts[:10]],
+        'pincodes': [{'entityName': pincode, 'metric': metric(rng, scale)} for pincode in pincodes],
+    })
+
+
+def top_user(rng, districts, pincodes):
+    return envelope({
+        'states': None,
+        'districts': [{'name': name, 'registeredUsers': rng.randint(100, 3000000)} for name in districts[:10]],
+        'pincodes': [{'name': pincode, 'registeredUsers': rng.randint(100, 500000)} for pincode in pincodes],
+    })
+
+
+def generate_tree(root, states=36, districts=20, pincodes=10, years=range(2018, 2025), seed=0):
+    """Write a synthetic pulse-master/data tree under root; returns the number of files"""
+    rng = random.Random(seed)
+    data_root = Path(root) / 'pulse-master' / 'data'
+    files = 0
+
+    for s in range(states):
+        state = f"synthetic-state-{s:03d}"
+        district_names = [f"district {s:03d}-{d:03d} district" for d in range(districts)]
+        pincode_names = [str(100000 + s * 1000 + p) for p in range(pincodes)]
+
+        for year in years:
+            for quarter in range(1, 5):
+                documents = {
+                    'aggregated/transaction/country/india/state': aggregated_transaction(rng, TRANSACTION_TYPES, 10**8),
+                    'aggregated/user/country/india/state': aggregated_user(rng),
+                    'aggregated/insurance/country/india/state': aggregated_transaction(rng, ['Insurance'], 10**5),
+                    'map/transaction/hover/country/india/state': map_transaction(rng, district_names, 10**7),
+                    'map/user/hover/country/india/state': map_user(rng, district_names),
+                    'map/insurance/hover/country/india/state': map_transaction(rng, district_names, 10**4),
+                    'top/transaction/country/india/state': top_transaction(rng, district_names, pincode_names, 10**7),
+                    'top/user/country/india/state': top_user(rng, district_names, pincode_names),
+                    'top/insurance/country/india/state': top_transaction(rng, district_names, pincode_names, 10**4),
+                }
+                for dataset_path, document in documents.items():
+                    folder = data_root / dataset_path / state / str(year)
+                    folder.mkdir(parents=True, exist_ok=True)
+                    (folder / f"{quarter}.json").write_text(json.dumps(document))
+                    files += 1
+
+    return files
+
+
+def parse_years(value):
+    """'2018-2030' -> range(2018, 2031)"""
+    first, _, last = value.partition('-')
+    return range(int(first), int(last or first) + 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('root', help="directory that will contain pulse-master/data")
+    parser.add_argument('--states', type=int, default=36)
+    parser.add_argument('--districts', type=int, default=20, help="districts per state")
+    parser.add_argument('--pincodes', type=int, default=10, help="top pincodes per state and quarter")
+    parser.add_argument('--years', type=parse_years, default=range(2018, 2025), help="e.g. 2018-2024")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    count = generate_tree(args.root, args.states, args.districts, args.pincodes, args.years, args.seed)
+    print(f"✅ Wrote {count} JSON files under {Path(args.root) / 'pulse-master' / 'data'}")
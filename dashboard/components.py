@@ -0,0 +1,80 @@
+import streamlit as st
+from dashboard import queries
+from dashboard.loaders import load_count, load_cube, load_page, load_partition, load_periods
+
+PAGE_SIZES = [25, 50, 100]
+
+def paged_table(table, year, quarter, key):
+    """Sortable, filterable data table backed by keyset-paginated SQL"""
+    dimensions, measures = queries.TABLES[table]['dimensions'], queries.TABLES[table]['measures']
+    col1, col2, col3, col4, col5 = st.columns([2, 1, 2, 2, 1])
+    with col1:
+        sort = st.selectbox("Sort by", measures + dimensions, key=f"{key}.sort")
+    with col2:
+        descending = st.checkbox("Descending", value=True, key=f"{key}.descending")
+    with col3:
+        filter_column = st.selectbox("Filter column", dimensions, key=f"{key}.filter_column")
+    with col4:
+        filter_text = st.text_input("Contains", key=f"{key}.filter_text")
+    with col5:
+        limit = st.selectbox("Rows", PAGE_SIZES, key=f"{key}.limit")
+    contains = ((filter_column, filter_text.strip()),) if filter_text.strip() else ()
+    
+    # Cursors of the pages visited so far; any change to the query starts over at page 1
+    query = (table, year, quarter, sort, descending, contains, limit)
+    state = st.session_state.setdefault(f"{key}.pages", {'query': query, 'cursors': [None]})
+    if state['query'] != query:
+        state.update(query=query, cursors=[None])
+    cursors = state['cursors']
+    
+    df, next_cursor = load_page(table, year, quarter, sort, descending, contains, cursors[-1], limit)
+    st.dataframe(df, use_container_width=True, hide_index=True)
+    
+    total = load_count(table, year, quarter, contains)
+    nav1, nav2, nav3 = st.columns([1, 4, 1])
+    with nav1:
+        st.button("◀ Previous", key=f"{key}.previous", disabled=len(cursors) == 1,
+                  on_click=lambda: cursors.pop())
+    with nav2:
+        first = (len(cursors) - 1) * limit
+        st.caption(f"Rows {first + 1 if len(df) else 0:,}–{first + len(df):,} of {total:,}")
+    with nav3:
+        st.button("Next ▶", key=f"{key}.next", disabled=next_cursor is None,
+                  on_click=lambda: cursors.append(next_cursor))
+
+def show_table(table, year, quarter, key):
+    if load_count(table, year, quarter, ()) == 0:
+        st.caption("No rows for this period in the database; rebuild it with "
+                   "`python src/setup_database.py --sqlite` to load district and pincode data.")
+        return
+    paged_table(table, year, quarter, f"{key}.{table}")
+    # The CSV is built only when the button is clicked
+    st.download_button("⬇️ Download period as CSV", file_name=f"{table}_{year}_Q{quarter}.csv",
+                       data=lambda: load_partition(table, year, quarter).to_csv(index=False),
+                       mime='text/csv', key=f"{key}.{table}.download")
+
+def select_period(table):
+    """Year and Quarter selectboxes populated from the table's available periods"""
+    periods = load_periods(table)
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_year = st.selectbox("Select Year", sorted(periods['Year'].unique()))
+    with col2:
+        selected_quarter = st.selectbox("Select Quarter", sorted(periods['Quarter'].unique()))
+    return int(selected_year), int(selected_quarter)
+
+def select_state(source, year, quarter, key):
+    """State selectbox listing the states the rollup has for the period"""
+    states = load_cube(source, 'State', year, quarter)['State'].tolist()
+    return st.selectbox("Select State", states, key=f"{key}.state")
+
+def default_period(table):
+    """The period select_period shows until the user picks another"""
+    periods = load_periods(table)
+    return int(periods['Year'].min()), int(periods['Quarter'].min())
+
+def warm_table(table, year, quarter):
+    """Prefetch the first page show_table renders with its default sort"""
+    if load_count(table, year, quarter, ()):
+        sort = (queries.TABLES[table]['measures'] + queries.TABLES[table]['dimensions'])[0]
+        load_page(table, year, quarter, sort, True, (), None, PAGE_SIZES[0])
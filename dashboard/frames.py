@@ -0,0 +1,76 @@
+import pandas as pd
+
+# Shared cached frames rely on copy-on-write: a caller that modifies one gets its own
+# copy instead of mutating the object every other session sees. Always on from pandas 3.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+
+def compact(df):
+    """Dictionary-encode text dimensions and downcast integer columns
+
+    Floats are left alone: transaction amounts reach 1e11+ and float32 would lose
+    the rupee precision shown in the tables.
+    """
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_integer_dtype(series.dtype):
+            columns[column] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_string_dtype(series.dtype) or series.dtype == object:
+            columns[column] = series.astype('category')
+        else:
+            columns[column] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def compact_result(value):
+    """compact() the frames of a loader result: a DataFrame, or a tuple holding some"""
+    if isinstance(value, tuple):
+        return tuple(compact_result(item) for item in value)
+    return compact(value) if isinstance(value, pd.DataFrame) else value
+
+
+def share(value):
+    """A caller's handle on a cached result, without copying its data
+
+    Frames and series become shallow copies: they share the cached column buffers, and
+    copy-on-write gives a caller that modifies one private copies of what it touches,
+    so the cached object every session reads stays as it was.
+    """
+    if isinstance(value, tuple):
+        return tuple(share(item) for item in value)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    return value
+
+
+def footprint(df):
+    """Deep memory usage of a frame in bytes"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def memory_report(frames):
+    """Before/after footprint of compact() for {table: DataFrame}"""
+    report = []
+    for table, df in frames.items():
+        before, after = footprint(df), footprint(compact(df))
+        report.append({
+            'Table': table,
+            'Rows': len(df),
+            'Before_bytes': before,
+            'After_bytes': after,
+            'Saved_pct': round(100 * (1 - after / before), 1) if before else 0.0,
+        })
+    return pd.DataFrame(report)
+
+
+if __name__ == "__main__":
+    # python -m dashboard.frames [phonepe_data.db]
+    import sys
+    import sqlite3
+    from dashboard.queries import TABLES
+
+    conn = sqlite3.connect(sys.argv[1] if len(sys.argv) > 1 else 'phonepe_data.db')
+    frames = {table: pd.read_sql(f"SELECT * FROM {table}", conn) for table in TABLES}
+    print(memory_report(frames).to_string(index=False))
@@ -0,0 +1,152 @@
+import os
+import functools
+from contextlib import contextmanager
+import streamlit as st
+from dashboard import queries
+from dashboard.pool import ReadOnlyPool
+from dashboard.result_cache import ResultCache
+from perf import start_metrics_server, traced
+
+# Cached loaders shared by every page. Nothing here imports pandas or plotly; queries
+# pull pandas in only when they build a frame, and a cache hit returns one.
+
+DB_PATH = 'phonepe_data.db'
+SNAPSHOT_ROOT = os.path.join(os.path.dirname(DB_PATH), 'snapshots')
+
+# PHONEPE_METRICS_PORT=<port> serves span timings on http://127.0.0.1:<port>/metrics
+@st.cache_resource
+def start_metrics():
+    port = os.environ.get('PHONEPE_METRICS_PORT')
+    return start_metrics_server(port) if port else None
+
+# Bounded pool of read-only connections shared by every session, so sessions query in
+# parallel, reruns reuse warm connections and a rebuild swapped over DB_PATH is picked
+# up on the next call without a restart
+@st.cache_resource
+def get_pool():
+    return ReadOnlyPool(DB_PATH)
+
+@contextmanager
+def database_connection():
+    pool = get_pool()
+    if not pool.exists():
+        st.error(f"Database file '{DB_PATH}' not found!")
+        yield None
+        return
+    with pool.connection() as conn:
+        yield conn
+
+def data_version(table):
+    return get_pool().data_version(table)
+
+# Query results are shared across sessions and worker processes through an on-disk
+# cache keyed on the data version of the table they read (PHONEPE_RESULT_CACHE=<path>),
+# and within a process through its in-memory layer, which returns the object itself
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
+
+def holds_frames(value):
+    """True for pandas results (or tuples holding one); checked without importing pandas"""
+    items = value if isinstance(value, tuple) else (value,)
+    return any(type(item).__module__.startswith('pandas') for item in items)
+
+def versioned(function):
+    """Cache a loader whose first argument is the table it reads
+
+    Frames are compacted once, before they are cached, and each caller gets a
+    copy-on-write view of the shared frame rather than a copy (see dashboard.frames).
+    """
+    def compute(table, *args):
+        value = function(table, *args)
+        if holds_frames(value):
+            from dashboard.frames import compact_result
+            value = compact_result(value)
+        return value
+
+    @functools.wraps(function)
+    def wrapper(table, *args):
+        value = get_result_cache().fetch(function.__name__, (table,) + args, table, data_version(table),
+                                         lambda: compute(table, *args))
+        if holds_frames(value):
+            from dashboard.frames import share
+            value = share(value)
+        return value
+    return wrapper
+
+# Load data: charts read the rollup cube built at ingestion and the data tables push
+# their filters down to SQL, so each result is sized by what is shown on screen
+@traced('loader.load_periods')
+@versioned
+def load_periods(table):
+    with database_connection() as conn:
+        return queries.periods(conn, table)
+
+@traced('loader.load_cube_totals')
+@versioned
+def load_cube_totals(source, year=0, quarter=0):
+    with database_connection() as conn:
+        return queries.cube_totals(conn, source, year, quarter)
+
+@traced('loader.load_cube')
+@versioned
+def load_cube(source, dimension, year, quarter):
+    with database_connection() as conn:
+        return queries.cube(conn, source, dimension, year, quarter)
+
+@traced('loader.load_top_n')
+@versioned
+def load_top_n(source, measure, dimension, year, quarter, limit=10):
+    with database_connection() as conn:
+        return queries.top_n(conn, source, measure, dimension, year, quarter, limit)
+
+# State drill-downs aggregate the district tables in SQL for one state and period;
+# the covering (Year, Quarter, State) index keeps each one a range read of that state
+@traced('loader.load_breakdown')
+@versioned
+def load_breakdown(table, dimension, measures, year, quarter, state, order_by, limit):
+    with database_connection() as conn:
+        return queries.breakdown(conn, table, dimension, list(measures), year, quarter, state,
+                                 order_by, limit)
+
+# Data tables fetch one keyset page at a time; sorting and filtering run in SQLite, so
+# a page costs the same and ships the same few rows whatever the table size
+@traced('loader.load_page')
+@versioned
+def load_page(table, year, quarter, sort, descending, contains, after, limit):
+    with database_connection() as conn:
+        return queries.page(conn, table, year, quarter, sort, descending,
+                            dict(contains), after, limit)
+
+@traced('loader.load_count')
+@versioned
+def load_count(table, year, quarter, contains):
+    with database_connection() as conn:
+        return queries.count(conn, table, year, quarter, dict(contains))
+
+@traced('loader.load_series')
+@versioned
+def load_series(source, measure, dimension, members):
+    with database_connection() as conn:
+        return queries.series(conn, source, measure, dimension,
+                              list(members) if members is not None else None)
+
+@traced('loader.load_movers')
+@versioned
+def load_movers(source, measure, dimension, limit):
+    with database_connection() as conn:
+        return queries.movers(conn, source, measure, dimension, limit=limit)
+
+# Whole-period exports read the Arrow snapshot the build wrote beside the database:
+# only the one (Year, Quarter) partition is opened, memory-mapped, and only the asked
+# columns are converted. Databases without a matching snapshot are read through SQL.
+@traced('loader.load_partition')
+def load_partition(table, year, quarter, columns=None):
+    version = get_pool().versions().get('version')
+    if version:
+        from dashboard.snapshot import read_partition
+        df = read_partition(SNAPSHOT_ROOT, version, table, year, quarter, columns)
+        if df is not None:
+            return df
+    with database_connection() as conn:
+        return queries.rows(conn, table, year, quarter, columns)
@@ -0,0 +1,38 @@
+import importlib
+
+# Sidebar label -> (module in this package, arguments of its render()). Modules are
+# imported on first visit, so plotly and pandas load only when a page needs them.
+PAGES = {
+    "Overview": ('overview', ()),
+    "Transactions": ('transactions', ()),
+    "Users": ('users', ()),
+    "Transaction Trends": ('trends', ('transactions',)),
+    "User Trends": ('trends', ('users',)),
+}
+
+
+def load(page):
+    """Import (once) and return the module behind a sidebar page"""
+    return importlib.import_module(f"{__name__}.{PAGES[page][0]}")
+
+
+def render(page):
+    load(page).render(*PAGES[page][1])
+
+
+def warm(page):
+    """Import a page and prefetch what it shows first, without rendering anything"""
+    module = load(page)
+    if hasattr(module, 'warm'):
+        module.warm(*PAGES[page][1])
+
+
+def warm_all():
+    """Warm every page; one failing page does not stop the rest"""
+    from perf import span
+    for page in PAGES:
+        try:
+            with span('warmup', page=page):
+                warm(page)
+        except Exception:
+            pass
@@ -0,0 +1,32 @@
+import streamlit as st
+from dashboard.loaders import load_cube_totals
+
+def render():
+    st.header("📊 Overview")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        try:
+            totals = load_cube_totals('aggregated_transaction')
+            total_transactions = int(totals['Transaction_count'])
+            total_amount = totals['Transaction_amount']
+            
+            st.metric("Total Transactions", f"{total_transactions:,}")
+            st.metric("Total Transaction Amount", f"₹{total_amount/1e9:.2f}B")
+        except Exception as e:
+            st.error(f"Error loading transaction data: {e}")
+    
+    with col2:
+        try:
+            totals = load_cube_totals('aggregated_user')
+            total_users = int(totals['Transaction_count'])
+            
+            st.metric("Total User Records", f"{int(totals['Records']):,}")
+            st.metric("Total Device Count", f"{total_users:,}")
+        except Exception as e:
+            st.error(f"Error loading user data: {e}")
+
+def warm():
+    load_cube_totals('aggregated_transaction')
+    load_cube_totals('aggregated_user')
@@ -0,0 +1,71 @@
+import streamlit as st
+import plotly.express as px
+from dashboard.components import default_period, select_period, select_state, show_table, warm_table
+from dashboard.loaders import load_breakdown, load_cube, load_top_n
+from perf import span
+
+# Tables behind the "Level" switch of the data table
+TRANSACTION_TABLES = {'By type': 'aggregated_transaction', 'By district': 'map_transaction',
+                      'By pincode': 'top_transaction'}
+
+def render():
+    st.header("💳 Transaction Analysis")
+    
+    try:
+        # Filters
+        selected_year, selected_quarter = select_period('aggregated_transaction')
+        
+        # Transaction by Type
+        st.subheader("Transactions by Type")
+        with span('chart.transactions_by_type'):
+            trans_by_type = load_cube('aggregated_transaction', 'Transaction_type',
+                                      selected_year, selected_quarter)
+            
+            fig = px.bar(trans_by_type, 
+                         x='Transaction_type', 
+                         y='Transaction_amount',
+                         title=f"Transaction Amount by Type (Q{selected_quarter} {selected_year})")
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # Top States
+        st.subheader("Top 10 States by Transaction Amount")
+        with span('chart.top_states_by_amount'):
+            top_states = load_top_n('aggregated_transaction', 'Transaction_amount', 'State',
+                                    selected_year, selected_quarter)
+            
+            fig2 = px.bar(top_states, 
+                          orientation='h',
+                          title=f"Top 10 States (Q{selected_quarter} {selected_year})")
+            st.plotly_chart(fig2, use_container_width=True)
+        
+        # Districts of one state
+        st.subheader("Top Districts in a State")
+        with span('chart.top_districts_by_amount'):
+            state = select_state('aggregated_transaction', selected_year, selected_quarter, "transactions")
+            districts = load_breakdown('map_transaction', 'District', ('Transaction_count', 'Transaction_amount'),
+                                       selected_year, selected_quarter, state, 'Transaction_amount', 10)
+            if districts.empty:
+                st.caption("No district data for this period in the database.")
+            else:
+                fig3 = px.bar(districts, x='Transaction_amount', y='District', orientation='h',
+                              hover_data=['Transaction_count'],
+                              title=f"Top 10 Districts of {state} (Q{selected_quarter} {selected_year})")
+                st.plotly_chart(fig3, use_container_width=True)
+        
+        # Data table
+        st.subheader("Transaction Data")
+        with span('chart.transaction_table'):
+            level = st.radio("Level", list(TRANSACTION_TABLES), horizontal=True, key="transactions.level")
+            show_table(TRANSACTION_TABLES[level], selected_year, selected_quarter, "transactions")
+        
+    except Exception as e:
+        st.error(f"Error: {e}")
+
+def warm():
+    year, quarter = default_period('aggregated_transaction')
+    load_cube('aggregated_transaction', 'Transaction_type', year, quarter)
+    load_top_n('aggregated_transaction', 'Transaction_amount', 'State', year, quarter)
+    state = load_cube('aggregated_transaction', 'State', year, quarter)['State'].iloc[0]
+    load_breakdown('map_transaction', 'District', ('Transaction_count', 'Transaction_amount'),
+                   year, quarter, state, 'Transaction_amount', 10)
+    warm_table(next(iter(TRANSACTION_TABLES.values())), year, quarter)
@@ -0,0 +1,72 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from dashboard.loaders import load_movers, load_series
+from perf import span
+
+# Trend pages: title, source table, measures, breakdown dimensions; all read rollup_series
+TRENDS = {
+    'transactions': ("Transaction Trends", 'aggregated_transaction',
+                     ['Transaction_amount', 'Transaction_count'], ['State', 'Transaction_type']),
+    'users': ("User Trends", 'aggregated_user', ['Transaction_count'], ['State', 'Brands']),
+}
+TOP_MOVERS = 20
+
+def format_growth(value):
+    return f"{value:+.1%}" if pd.notna(value) else None
+
+def render(kind):
+    title, source, measures, dimensions = TRENDS[kind]
+    st.header(f"📈 {title}")
+    
+    try:
+        measure = st.selectbox("Measure", measures) if len(measures) > 1 else measures[0]
+        
+        # National series
+        with span('chart.trend_total'):
+            total = load_series(source, measure, 'All', None)
+            if total.empty:
+                st.caption("No trend data in this database; rebuild or migrate it with "
+                           "`python src/sqlite_store.py phonepe_data.db`.")
+                return
+            latest = total.iloc[-1]
+            col1, col2, col3 = st.columns(3)
+            col1.metric(f"{measure} ({latest['Period']})", f"{latest['Value']:,.0f}")
+            col2.metric("Quarter on quarter", format_growth(latest['QoQ']))
+            col3.metric("Year on year", format_growth(latest['YoY']))
+            
+            fig = px.line(total, x='Period', y=['Value', 'Rolling_avg'],
+                          title=f"{measure}: quarterly and 4-quarter rolling average")
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # Breakdown by one dimension
+        dimension = st.radio("Break down by", dimensions, horizontal=True, key=f"{source}.trend_dimension")
+        with span('chart.trend_breakdown'):
+            ranking = load_movers(source, measure, dimension, 1000)
+            options = ranking[dimension].tolist()
+            members = st.multiselect(f"{dimension} to compare", options, default=options[:5],
+                                     key=f"{source}.{dimension}.trend_members")
+            if members:
+                lines = load_series(source, measure, dimension, tuple(members))
+                st.plotly_chart(px.line(lines, x='Period', y='Value', color=dimension,
+                                        title=f"{measure} by {dimension}"), use_container_width=True)
+                st.plotly_chart(px.line(lines, x='Period', y='YoY', color=dimension,
+                                        title="Year-on-year growth"), use_container_width=True)
+        
+        # Rank movement in the latest quarter
+        if not ranking.empty:
+            st.subheader(f"Rankings, Q{ranking['Quarter'].iloc[0]} {ranking['Year'].iloc[0]}")
+            with span('chart.trend_movers'):
+                table = ranking.drop(columns=['Year', 'Quarter']).head(TOP_MOVERS)
+                st.dataframe(table, use_container_width=True, hide_index=True)
+    
+    except Exception as e:
+        st.error(f"Error: {e}")
+
+def warm(kind):
+    title, source, measures, dimensions = TRENDS[kind]
+    measure, dimension = measures[0], dimensions[0]
+    load_series(source, measure, 'All', None)
+    ranking = load_movers(source, measure, dimension, 1000)
+    if not ranking.empty:
+        load_series(source, measure, dimension, tuple(ranking[dimension].tolist()[:5]))
@@ -0,0 +1,69 @@
+import streamlit as st
+import plotly.express as px
+from dashboard.components import default_period, select_period, select_state, show_table, warm_table
+from dashboard.loaders import load_breakdown, load_cube, load_top_n
+from perf import span
+
+# Tables behind the "Level" switch of the data table
+USER_TABLES = {'By brand': 'aggregated_user', 'By district': 'map_user', 'By pincode': 'top_user'}
+
+def render():
+    st.header("👥 User Analysis")
+    
+    try:
+        # Filters
+        selected_year, selected_quarter = select_period('aggregated_user')
+        
+        # Top Brands
+        st.subheader("Top Mobile Brands")
+        with span('chart.top_brands'):
+            brand_data = load_top_n('aggregated_user', 'Transaction_count', 'Brands',
+                                    selected_year, selected_quarter)
+            
+            fig = px.pie(values=brand_data.values, 
+                         names=brand_data.index,
+                         title=f"Top 10 Mobile Brands (Q{selected_quarter} {selected_year})")
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # State-wise Users
+        st.subheader("State-wise User Distribution")
+        with span('chart.top_states_by_users'):
+            state_users = load_top_n('aggregated_user', 'Transaction_count', 'State',
+                                     selected_year, selected_quarter)
+            
+            fig2 = px.bar(state_users,
+                          orientation='h',
+                          title=f"Top 10 States by Users (Q{selected_quarter} {selected_year})")
+            st.plotly_chart(fig2, use_container_width=True)
+        
+        # Districts of one state
+        st.subheader("Top Districts in a State")
+        with span('chart.top_districts_by_users'):
+            state = select_state('aggregated_user', selected_year, selected_quarter, "users")
+            districts = load_breakdown('map_user', 'District', ('RegisteredUsers', 'AppOpens'),
+                                       selected_year, selected_quarter, state, 'RegisteredUsers', 10)
+            if districts.empty:
+                st.caption("No district data for this period in the database.")
+            else:
+                fig3 = px.bar(districts, x='RegisteredUsers', y='District', orientation='h',
+                              hover_data=['AppOpens'],
+                              title=f"Top 10 Districts of {state} by Registered Users (Q{selected_quarter} {selected_year})")
+                st.plotly_chart(fig3, use_container_width=True)
+        
+        # Data table
+        st.subheader("User Data")
+        with span('chart.user_table'):
+            level = st.radio("Level", list(USER_TABLES), horizontal=True, key="users.level")
+            show_table(USER_TABLES[level], selected_year, selected_quarter, "users")
+        
+    except Exception as e:
+        st.error(f"Error: {e}")
+
+def warm():
+    year, quarter = default_period('aggregated_user')
+    load_top_n('aggregated_user', 'Transaction_count', 'Brands', year, quarter)
+    load_top_n('aggregated_user', 'Transaction_count', 'State', year, quarter)
+    state = load_cube('aggregated_user', 'State', year, quarter)['State'].iloc[0]
+    load_breakdown('map_user', 'District', ('RegisteredUsers', 'AppOpens'),
+                   year, quarter, state, 'RegisteredUsers', 10)
+    warm_table(next(iter(USER_TABLES.values())), year, quarter)
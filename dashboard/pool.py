@@ -0,0 +1,116 @@
+import os
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from dashboard.queries import data_versions
+
+# Per-connection read tuning: map the file instead of copying pages through the page
+# cache, and give each connection a modest private cache on top.
+READ_PRAGMAS = {
+    'query_only': 1,
+    'mmap_size': 256 * 2**20,
+    'cache_size': -32768,  # negative = KiB, i.e. 32 MB
+    'temp_store': 'MEMORY',
+}
+
+# Most connections open at once per process (PHONEPE_DB_POOL_SIZE); further
+# checkouts wait for one to be returned
+DEFAULT_SIZE = int(os.environ.get('PHONEPE_DB_POOL_SIZE', '8'))
+CHECKOUT_TIMEOUT = 30
+
+
+class ReadOnlyPool:
+    """Bounded pool of read-only SQLite connections that follow atomic file swaps
+
+    Connections are checked out for one query and returned, so they outlive the
+    Streamlit script threads, which are new on every rerun. Every connection is opened
+    with a mode=ro URI, so a dashboard can never write to or lock out the builder.
+    Builders write a side file and os.replace() it over db_path; idle connections
+    remember the file they were opened on and are closed instead of reused once it
+    has been replaced, while queries already running finish against the old file,
+    which the OS keeps alive until they close it.
+
+    Swapped-in files stay in rollback-journal mode on purpose: a -wal file left behind
+    by the previous database would be replayed against the new one.
+    """
+
+    def __init__(self, db_path, size=DEFAULT_SIZE, pragmas=None):
+        self.db_path = Path(db_path)
+        self.pragmas = {**READ_PRAGMAS, **(pragmas or {})}
+        self._idle = queue.LifoQueue()  # (signature, connection), most recently used first
+        self._slots = threading.BoundedSemaphore(size)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def signature(self):
+        """Identity of the current database file; changes whenever it is replaced"""
+        stat = os.stat(self.db_path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def exists(self):
+        return self.db_path.exists()
+
+    def open(self):
+        conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        for pragma, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection to the current file for the duration of a with block"""
+        if not self._slots.acquire(timeout=CHECKOUT_TIMEOUT):
+            raise TimeoutError(f"no connection to {self.db_path} free after {CHECKOUT_TIMEOUT}s")
+        conn = None
+        try:
+            signature = self.signature()
+            while conn is None:
+                try:
+                    opened_on, idle = self._idle.get_nowait()
+                except queue.Empty:
+                    conn = self.open()
+                    break
+                if opened_on == signature:
+                    conn = idle
+                else:
+                    idle.close()
+            yield conn
+        finally:
+            if conn is not None:
+                self._idle.put((signature, conn))
+            self._slots.release()
+
+    def close(self):
+        """Close the idle connections"""
+        while True:
+            try:
+                self._idle.get_nowait()[1].close()
+            except queue.Empty:
+                return
+
+    def versions(self):
+        """build_info data versions of the current file, read once per file"""
+        signature = self.signature()
+        versions = self._versions.get(signature)
+        if versions is None:
+            with self.connection() as conn:
+                versions = data_versions(conn)
+                schema = conn.execute("PRAGMA user_version").fetchone()[0]
+            # A migration rebuilds the rollups without restamping the tables, so cached
+            # results are keyed on the schema too
+            versions = {key: f"{value}/schema-{schema}" for key, value in versions.items()}
+            with self._lock:
+                self._versions = {signature: versions}
+        return versions
+
+    def data_version(self, table):
+        """Version of one table's contents as stamped by the ingestion run
+
+        Falls back to the build version, then to the file identity for databases built
+        before tables were versioned.
+        """
+        versions = self.versions()
+        return (versions.get(f"version:{table}") or versions.get('version')
+                or "file:%d-%d-%d" % self.signature())
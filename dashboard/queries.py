@@ -0,0 +1,231 @@
+# Tables the dashboard may query, with their dimension and measure columns.
+# Only names listed here are ever interpolated into SQL; values are always bound.
+TABLES = {
+    'aggregated_transaction': {
+        'dimensions': ['State', 'Transaction_type'],
+        'measures': ['Transaction_count', 'Transaction_amount'],
+    },
+    'aggregated_user': {
+        'dimensions': ['State', 'Brands'],
+        'measures': ['Transaction_count', 'Percentage'],
+    },
+    'map_transaction': {
+        'dimensions': ['State', 'District'],
+        'measures': ['Transaction_count', 'Transaction_amount'],
+    },
+    'map_user': {
+        'dimensions': ['State', 'District'],
+        'measures': ['RegisteredUsers', 'AppOpens'],
+    },
+    'top_transaction': {
+        'dimensions': ['State', 'Pincode'],
+        'measures': ['Transaction_count', 'Transaction_amount'],
+    },
+    'top_user': {
+        'dimensions': ['State', 'Pincode'],
+        'measures': ['RegisteredUsers'],
+    },
+}
+
+
+def read_sql(query, conn, params=None):
+    """pd.read_sql; pandas is imported on first use so scalar lookups never load it"""
+    import pandas as pd
+    return pd.read_sql(query, conn, params=params)
+
+
+def _check(table, columns=()):
+    """Reject any table or column name not declared in TABLES"""
+    if table not in TABLES:
+        raise ValueError(f"Unknown table: {table}")
+    allowed = TABLES[table]['dimensions'] + TABLES[table]['measures'] + ['Year', 'Quarter']
+    for column in columns:
+        if column not in allowed:
+            raise ValueError(f"Unknown column for {table}: {column}")
+
+
+def _where(year=None, quarter=None, state=None):
+    """WHERE clause and parameters for the optional period/state filters"""
+    clauses, params = [], []
+    for column, value in (('Year', year), ('Quarter', quarter), ('State', state)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(int(value) if column != 'State' else value)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def data_versions(conn):
+    """{'version': ..., 'version:<table>': ...} from build_info; empty for older databases"""
+    try:
+        return dict(conn.execute("SELECT Key, Value FROM build_info WHERE Key LIKE 'version%'").fetchall())
+    except Exception:
+        return {}
+
+
+def periods(conn, table):
+    """Distinct (Year, Quarter) pairs available in a table"""
+    _check(table)
+    return read_sql(f"SELECT DISTINCT Year, Quarter FROM {table} ORDER BY Year, Quarter", conn)
+
+
+def breakdown(conn, table, dimension, measures, year=None, quarter=None, state=None,
+              order_by=None, limit=None):
+    """Measures summed by one dimension for the filtered slice, optionally top-N"""
+    _check(table, [dimension] + list(measures) + ([order_by] if order_by else []))
+    where, params = _where(year, quarter, state)
+    sums = ', '.join(f"SUM({measure}) AS {measure}" for measure in measures)
+    query = f"SELECT {dimension}, {sums} FROM {table}{where} GROUP BY {dimension}"
+    if order_by:
+        query += f" ORDER BY {order_by} DESC, {dimension}"
+    if limit:
+        query += " LIMIT ?"
+        params.append(int(limit))
+    return read_sql(query, conn, params=params)
+
+
+def rows(conn, table, year=None, quarter=None, columns=None):
+    """Raw rows of the filtered slice, optionally only some columns"""
+    _check(table, columns or [])
+    where, params = _where(year, quarter)
+    select = ', '.join(columns) if columns else '*'
+    return read_sql(f"SELECT {select} FROM {table}{where}", conn, params=params)
+
+
+def key_columns(table):
+    """Primary key of a table: State, Year, Quarter and its own dimension"""
+    return ['State', 'Year', 'Quarter', TABLES[table]['dimensions'][-1]]
+
+
+def order_columns(table, sort=None):
+    """Sort column first, then the rest of the key so the order is total"""
+    key = key_columns(table)
+    return ([sort] if sort else []) + [column for column in key if column != sort]
+
+
+def _filters(table, year=None, quarter=None, contains=None, expressions=None):
+    """Period filter plus case-insensitive substring filters on dimension columns
+
+    expressions maps a column to the SQL that reads it when the query is not on the view.
+    """
+    where, params = _where(year, quarter)
+    clauses = [where[len(" WHERE "):]] if where else []
+    for column, text in (contains or {}).items():
+        if column not in TABLES[table]['dimensions']:
+            raise ValueError(f"Not a dimension of {table}: {column}")
+        if text:
+            escaped = str(text).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            clauses.append(f"CAST({(expressions or {}).get(column, column)} AS TEXT) LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+    return clauses, params
+
+
+def count(conn, table, year=None, quarter=None, contains=None):
+    """Rows matching the period and substring filters"""
+    _check(table)
+    clauses, params = _filters(table, year, quarter, contains)
+    where = " WHERE " + " AND ".join(clauses) if clauses else ""
+    return int(conn.execute(f"SELECT COUNT(*) FROM {table}{where}", params).fetchone()[0])
+
+
+def page(conn, table, year=None, quarter=None, sort=None, descending=False, contains=None,
+         after=None, limit=50):
+    """One page of raw rows, keyset-paginated; returns (DataFrame, cursor of the next page)
+
+    Rows come in order_columns(table, sort) order. The page is read from the table's
+    integer-keyed fact table and ordered on its keys, which are numbered in name order,
+    so for a period every sort column has an index that holds the rows in page order
+    (see sqlite_store.create_index_sql). `after` is the cursor returned with the
+    previous page, its last row's keys; each page is then a range scan of that index
+    starting at the cursor and stopping after `limit` rows, whatever the page number or
+    table size. The cursor is None after the last page.
+    """
+    from dimensions import DIMENSIONS, fact_table, key_column
+    _check(table, [sort] if sort else [])
+    columns = key_columns(table) + TABLES[table]['measures']
+    names = {column: f"{DIMENSIONS[column]}.Name" if column in DIMENSIONS else f"facts.{column}"
+             for column in columns}
+    joins = ''.join(f" LEFT JOIN {DIMENSIONS[column]} ON {DIMENSIONS[column]}.Id = facts.{key_column(column)}"
+                    for column in columns if column in DIMENSIONS)
+    keys = [f"facts.{key_column(column)}" for column in order_columns(table, sort)]
+
+    clauses, params = _filters(table, year, quarter, contains, names)
+    direction = "DESC" if descending else "ASC"
+    if after is not None:
+        placeholders = ', '.join('?' * len(keys))
+        clauses.append(f"({', '.join(keys)}) {'<' if descending else '>'} ({placeholders})")
+        params.extend(after)
+    where = " WHERE " + " AND ".join(clauses) if clauses else ""
+    select = ', '.join([f"{names[column]} AS {column}" for column in columns]
+                       + [f"{key} AS Key_{position}" for position, key in enumerate(keys)])
+    query = (f"SELECT {select} FROM {fact_table(table)} facts{joins}{where} "
+             f"ORDER BY {', '.join(f'{key} {direction}' for key in keys)} LIMIT ?")
+    df = read_sql(query, conn, params=params + [int(limit) + 1])
+    rows = df.iloc[:limit]
+    if len(df) <= limit:
+        return rows[columns], None
+    # numpy scalars would be bound as blobs, which compare greater than any number
+    last = rows.iloc[-1]
+    return rows[columns], tuple(last[f"Key_{position}"].item() for position in range(len(keys)))
+
+
+# Rollup lookups: each chart below is a single keyed read of the cube built at ingestion
+
+def cube_totals(conn, source, year=0, quarter=0):
+    """{measure: grand total} of every rolled-up measure (Year = 0 / Quarter = 0 mean all)"""
+    _check(source)
+    return dict(conn.execute("SELECT Measure, Value FROM rollup_cube WHERE Source = ? AND Dimension = 'All' "
+                             "AND Year = ? AND Quarter = ?", [source, int(year), int(quarter)]))
+
+
+def cube(conn, source, dimension, year=0, quarter=0):
+    """Every rolled-up measure by dimension member, one column per measure"""
+    _check(source, [dimension])
+    df = read_sql("SELECT Member, Measure, Value FROM rollup_cube WHERE Source = ? AND Dimension = ? "
+                  "AND Year = ? AND Quarter = ?", conn, params=[source, dimension, int(year), int(quarter)])
+    df = df.pivot(index='Member', columns='Measure', values='Value')
+    df.index.name, df.columns.name = dimension, None
+    return df.reset_index()
+
+
+def top_n(conn, source, measure, dimension, year=0, quarter=0, limit=10):
+    """Precomputed top members of a dimension by one measure, as a Series"""
+    _check(source, [measure, dimension])
+    df = read_sql("SELECT Member, Value FROM rollup_topn WHERE Source = ? AND Measure = ? AND Dimension = ? "
+                  "AND Year = ? AND Quarter = ? AND Position <= ? ORDER BY Position", conn,
+                  params=[source, measure, dimension, int(year), int(quarter), int(limit)])
+    return df.set_index('Member')['Value'].rename_axis(dimension).rename(measure)
+
+
+def series(conn, source, measure, dimension='All', members=None):
+    """Quarterly series with growth, rolling average and rank for dimension members
+
+    Dimension 'All' is the national total (Member ''). One keyed range read per member.
+    """
+    _check(source, [measure] + ([dimension] if dimension != 'All' else []))
+    query = ("SELECT Member, Year, Quarter, Value, QoQ, YoY, Rolling_avg, Position, Position_change "
+             "FROM rollup_series WHERE Source = ? AND Measure = ? AND Dimension = ?")
+    params = [source, measure, dimension]
+    if members is not None:
+        query += f" AND Member IN ({', '.join('?' * len(members))})"
+        params.extend(members)
+    df = read_sql(query + " ORDER BY Member, Year, Quarter", conn, params=params)
+    df['Period'] = df['Year'].astype(str) + '-Q' + df['Quarter'].astype(str)
+    return df.rename(columns={'Member': dimension})
+
+
+def movers(conn, source, measure, dimension, year=None, quarter=None, limit=10):
+    """Members of one quarter (default: the latest with data) by rank, with growth and rank change"""
+    _check(source, [measure, dimension])
+    params = [source, measure, dimension]
+    if year is None or quarter is None:
+        row = conn.execute("SELECT Year, Quarter FROM rollup_series WHERE Source = ? AND Measure = ? "
+                           "AND Dimension = ? ORDER BY Year DESC, Quarter DESC LIMIT 1", params).fetchone()
+        if row is None:
+            import pandas as pd
+            return pd.DataFrame(columns=[dimension, 'Year', 'Quarter', 'Value', 'QoQ', 'YoY',
+                                         'Position', 'Position_change'])
+        year, quarter = row
+    df = read_sql("SELECT Member, Year, Quarter, Value, QoQ, YoY, Position, Position_change FROM rollup_series "
+                  "WHERE Source = ? AND Measure = ? AND Dimension = ? AND Year = ? AND Quarter = ? "
+                  "ORDER BY Position, Member LIMIT ?", conn, params=params + [int(year), int(quarter), int(limit)])
+    return df.rename(columns={'Member': dimension})
@@ -0,0 +1,207 @@
+import os
+import time
+import pickle
+import sqlite3
+import hashlib
+import queue
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from contextlib import contextmanager
+
+# Query results shared by every Streamlit worker process on the host. Entries are keyed
+# on (query, parameters, data version of the table they read), so a rebuilt table simply
+# stops matching its old entries; those are deleted the first time a reader sees the new
+# version, and least-recently-used entries go once the cache exceeds max_bytes.
+DEFAULT_PATH = os.environ.get('PHONEPE_RESULT_CACHE', '.cache/query_results.db')
+DEFAULT_MAX_BYTES = int(os.environ.get('PHONEPE_RESULT_CACHE_MB', '256')) * 2**20
+
+# Results this process has already unpickled are also kept in memory and the same object
+# is returned to every later caller, so a repeated hit costs neither a read nor a
+# pickle.loads. Bounded by the entries' pickled size, least recently used out first.
+DEFAULT_MEMORY_BYTES = int(os.environ.get('PHONEPE_RESULT_MEMORY_MB', '64')) * 2**20
+
+# Hits refresh an entry's access time at most this often, to keep reads mostly read-only
+TOUCH_INTERVAL = 5.0
+
+# Idle connections kept for reuse; more can be open at once under load, the extras are
+# closed when returned
+MAX_IDLE = 8
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    Key TEXT PRIMARY KEY,
+    TableName TEXT NOT NULL,
+    Version TEXT NOT NULL,
+    Query TEXT NOT NULL,
+    Size INTEGER NOT NULL,
+    Accessed REAL NOT NULL,
+    Value BLOB NOT NULL
+)
+"""
+
+
+def make_key(query, params, version):
+    """Stable cache key for one call"""
+    return hashlib.sha1(repr((query, params, version)).encode()).hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU cache of pickled query results in a SQLite file
+
+    Values are shared, not copied: every hit in the in-process layer returns the same
+    object, so callers must not modify it (the dashboard loaders hand out frames.share()
+    views instead).
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES, memory_bytes=DEFAULT_MEMORY_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self._idle = queue.LifoQueue(maxsize=MAX_IDLE)
+        self._seen = {}
+        self._memory = OrderedDict()  # key -> (table, version, pickled size, value)
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        with self.connection() as conn:
+            # WAL is a property of the file, so it is set once here rather than per connection
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_accessed ON results (Accessed)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_table ON results (TableName, Version)")
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection; returned ones are reused by later calls from any thread
+
+        WAL lets processes read while another writes.
+        """
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            yield conn
+        finally:
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def get(self, key):
+        """(True, value) on a hit, (False, None) on a miss; memory first, then the file"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return True, entry[3]
+        with self.connection() as conn:
+            row = conn.execute("SELECT Value, Accessed, TableName, Version FROM results WHERE Key = ?",
+                               (key,)).fetchone()
+            if row is None:
+                return False, None
+            now = time.time()
+            if now - row[1] > TOUCH_INTERVAL:
+                conn.execute("UPDATE results SET Accessed = ? WHERE Key = ?", (now, key))
+        value = pickle.loads(row[0])
+        self.remember(key, row[2], row[3], len(row[0]), value)
+        return True, value
+
+    def remember(self, key, table, version, size, value):
+        """Keep a value in process, dropping least-recently-used ones beyond memory_bytes"""
+        if size > self.memory_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_used -= old[2]
+            self._memory[key] = (table, version, size, value)
+            self._memory_used += size
+            while self._memory_used > self.memory_bytes:
+                _, (_, _, dropped, _) = self._memory.popitem(last=False)
+                self._memory_used -= dropped
+
+    def forget(self, table=None, version=None):
+        """Drop in-process entries of `table` (all tables if None) not computed from `version`"""
+        with self._lock:
+            for key, (entry_table, entry_version, size, _) in list(self._memory.items()):
+                if table in (None, entry_table) and entry_version != version:
+                    del self._memory[key]
+                    self._memory_used -= size
+
+    def put(self, key, table, version, query, value):
+        """Store a result and evict least-recently-used entries beyond max_bytes"""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (Key, TableName, Version, Query, Size, Accessed, Value) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, table, version, query, len(blob), time.time(), sqlite3.Binary(blob)),
+            )
+        self.remember(key, table, version, len(blob), value)
+        self.evict()
+
+    def evict(self):
+        """Drop the oldest entries until the cache fits in max_bytes"""
+        with self.connection() as conn:
+            excess = (conn.execute("SELECT COALESCE(SUM(Size), 0) FROM results").fetchone()[0]) - self.max_bytes
+            if excess <= 0:
+                return 0
+            victims = []
+            for key, size in conn.execute("SELECT Key, Size FROM results ORDER BY Accessed"):
+                victims.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            conn.executemany("DELETE FROM results WHERE Key = ?", victims)
+        return len(victims)
+
+    def invalidate(self, table, version):
+        """Delete a table's entries computed from any version other than `version`"""
+        self.forget(table, version)
+        with self.connection() as conn:
+            return conn.execute(
+                "DELETE FROM results WHERE TableName = ? AND Version != ?", (table, version)
+            ).rowcount
+
+    def observe(self, table, version):
+        """Invalidate a table's stale entries the first time this process sees a new version"""
+        if self._seen.get(table) != version:
+            self.invalidate(table, version)
+            self._seen[table] = version
+
+    def fetch(self, query, params, table, version, compute):
+        """Cached result of compute() for (query, params) against `version` of `table`"""
+        self.observe(table, version)
+        key = make_key(query, params, version)
+        hit, value = self.get(key)
+        if not hit:
+            value = compute()
+            self.put(key, table, version, query, value)
+        return value
+
+    def stats(self):
+        """Entry count and total bytes per table"""
+        with self.connection() as conn:
+            return conn.execute(
+                "SELECT TableName, Version, COUNT(*), SUM(Size) FROM results GROUP BY TableName, Version"
+            ).fetchall()
+
+    def clear(self):
+        self.forget()
+        with self.connection() as conn:
+            conn.execute("DELETE FROM results")
+
+
+if __name__ == "__main__":
+    # python -m dashboard.result_cache [stats|clear]
+    import sys
+    cache = ResultCache()
+    if sys.argv[1:] == ['clear']:
+        cache.clear()
+        print(f"✅ Cleared {cache.path}")
+    else:
+        for table, version, entries, size in cache.stats():
+            print(f"{table:<28} {version:<20} {entries:>6} entries {size / 2**10:>10.1f} KiB")
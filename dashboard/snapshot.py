@@ -0,0 +1,34 @@
+import pandas as pd
+import pyarrow as pa
+from pathlib import Path
+
+# Reader for the Arrow IPC snapshots written by src/snapshot.py
+PART_GLOB = 'part-*.arrow'
+
+
+def read_partition(snapshot_root, version, table, year, quarter, columns=None):
+    """Rows of one (Year, Quarter) partition as a DataFrame, or None if it is missing
+
+    Only the requested partition's files are opened (partition pruning), they are
+    memory-mapped rather than read, and only `columns` are materialized.
+    """
+    part_dir = Path(snapshot_root) / version / table / f"Year={int(year)}" / f"Quarter={int(quarter)}"
+    paths = sorted(part_dir.glob(PART_GLOB))
+    if not paths:
+        return None
+
+    pieces = []
+    for path in paths:
+        with pa.memory_map(str(path)) as source:
+            arrow_table = pa.ipc.open_file(source).read_all()
+            stored = [column for column in (columns or arrow_table.column_names)
+                      if column in arrow_table.column_names]
+            pieces.append(arrow_table.select(stored).to_pandas())
+    df = pieces[0] if len(pieces) == 1 else pd.concat(pieces, ignore_index=True)
+
+    # Partition keys live in the path; put them back where SELECT * would have them
+    if columns is None or 'Year' in columns:
+        df.insert(min(1, len(df.columns)), 'Year', int(year))
+    if columns is None or 'Quarter' in columns:
+        df.insert(min(2, len(df.columns)), 'Quarter', int(quarter))
+    return df[columns] if columns else df
@@ -1,8 +1,15 @@
-import pandas as pd
-import sqlite3
-from sqlalchemy import create_engine
+import os
+import sys
+from sqlalchemy import create_engine, inspect, text
 from urllib.parse import quote_plus
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from ingestion import DATASETS
+from sqlite_store import build_database, new_version, table_columns
+
+# Rows fetched from MySQL and written to SQLite per round trip
+CHUNK_SIZE = 50000
+
 # MySQL connection
 mysql_config = {
     'host': 'localhost',
@@ -16,33 +23,51 @@ mysql_engine = create_engine(
     f"{mysql_config['host']}/{mysql_config['database']}"
 )
 
-# SQLite connection
-sqlite_conn = sqlite3.connect('phonepe_data.db')
+db_path = 'phonepe_data.db'
 
-# Tables to migrate
-tables = [
-    'aggregated_transaction',
-    'aggregated_user',
-    'map_transaction',
-    'map_user',
-    'top_transaction',
-    'top_user'
-]
 
-print("Starting data migration from MySQL to SQLite...")
+def migrated_tables():
+    """DATASETS tables present in MySQL, reporting the ones that are not
+
+    Databases loaded by older setups lack the insurance and district tables; those are
+    skipped and stay empty in SQLite instead of failing the whole migration.
+    """
+    available = set(inspect(mysql_engine).get_table_names())
+    missing = [table for table in DATASETS if table not in available]
+    if missing:
+        print(f"⚠️ Not in MySQL, left empty in SQLite: {', '.join(missing)}")
+    return [table for table in DATASETS if table in available]
+
 
-for table in tables:
-    try:
+def batches(tables):
+    """Stream each table as (table, rows) chunks with a server-side cursor
+
+    build_database turns the names in the rows into integer keys into the dimension tables.
+    """
+    for table in tables:
         print(f"\nMigrating {table}...")
-        # Read from MySQL
-        df = pd.read_sql(f"SELECT * FROM {table}", mysql_engine)
-        print(f"  Found {len(df)} records")
-        
-        # Write to SQLite
-        df.to_sql(table, sqlite_conn, if_exists='replace', index=False)
-        print(f"  ✅ Successfully migrated {table}")
-    except Exception as e:
-        print(f"  ❌ Error migrating {table}: {e}")
-
-sqlite_conn.close()
-print("\n✅ Migration complete! Database saved as 'phonepe_data.db'")
\ No newline at end of file
+        columns = ', '.join(column for column, _ in table_columns(table))
+        migrated = 0
+        with mysql_engine.connect().execution_options(stream_results=True) as mysql_conn:
+            result = mysql_conn.execute(text(f"SELECT {columns} FROM {table}"))
+            for chunk in result.partitions(CHUNK_SIZE):
+                rows = [tuple(row) for row in chunk]
+                migrated += len(rows)
+                yield table, rows
+        print(f"  ✅ Migrated {migrated} records")
+
+
+print("Starting data migration from MySQL to SQLite...")
+
+# The database is written to a side file, validated and renamed into place under the
+# build lock; any failed table leaves the existing database untouched. A fresh version
+# lets running dashboards drop cached results for changed tables.
+try:
+    tables = migrated_tables()
+    if not tables:
+        raise RuntimeError(f"none of {', '.join(DATASETS)} exists in MySQL")
+    build_database(db_path, batches(tables), new_version())
+except Exception as e:
+    print(f"\n❌ Migration failed, {db_path} was not replaced: {e}")
+    sys.exit(1)
+print(f"\n✅ Migration complete! Database saved as '{db_path}'")
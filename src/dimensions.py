@@ -0,0 +1,134 @@
+"""Integer surrogate keys for the names repeated in every fact row
+
+Fact tables store a small integer per dimension member instead of the name: State,
+District, Transaction_type, Insurance_type and Brands each get a dimension table
+(Id INTEGER PRIMARY KEY, Name). Pincodes are already integers and are stored as they
+are. A view named after each dataset joins the names back, so readers still see the
+original columns; aggregations group the fact tables by key and join a name per group.
+"""
+from ingestion import DATASETS, KEY_COLUMNS
+
+# Named column -> dimension table holding its members
+DIMENSIONS = {
+    'State': 'dim_state',
+    'District': 'dim_district',
+    'Transaction_type': 'dim_transaction_type',
+    'Insurance_type': 'dim_insurance_type',
+    'Brands': 'dim_brand',
+}
+
+
+def key_column(column):
+    """Fact table column holding the key of a dimension column"""
+    return f"{column}_id" if column in DIMENSIONS else column
+
+
+def fact_table(dataset):
+    """Integer-keyed table behind a dataset's view"""
+    return f"fact_{dataset}"
+
+
+def dataset_dimensions(dataset):
+    """[(position in a row, column)] of the dimension columns of a dataset's rows"""
+    return [(position, column) for position, column in enumerate(KEY_COLUMNS + DATASETS[dataset]['columns'])
+            if column in DIMENSIONS]
+
+
+def create_dimension_sql(column):
+    """CREATE TABLE statement for the members of a dimension column"""
+    return (f"CREATE TABLE IF NOT EXISTS {DIMENSIONS[column]} (\n"
+            f"    Id INTEGER PRIMARY KEY,\n    Name TEXT NOT NULL UNIQUE\n)")
+
+
+def create_view_sql(dataset):
+    """View with the dataset's original columns, names joined back from the dimensions
+
+    LEFT JOINs on the dimension primary key let SQLite drop the joins entirely from
+    queries that do not read a name, such as COUNT(*) or the period list.
+    """
+    columns, joins = [], []
+    for column in KEY_COLUMNS + DATASETS[dataset]['columns']:
+        if column in DIMENSIONS:
+            alias = DIMENSIONS[column]
+            columns.append(f"{alias}.Name AS {column}")
+            joins.append(f"LEFT JOIN {alias} ON {alias}.Id = facts.{key_column(column)}")
+        else:
+            columns.append(f"facts.{column}")
+    return (f"CREATE VIEW IF NOT EXISTS {dataset} AS\nSELECT {', '.join(columns)}\n"
+            f"FROM {fact_table(dataset)} facts\n" + '\n'.join(joins))
+
+
+class DimensionKeys:
+    """Name -> key lookup for every dimension, assigning keys to new names as they appear
+
+    The lookup is the cache: each name is resolved with one dict hit per row, and only
+    names not seen before are queued for insertion into the dimension tables.
+    """
+
+    def __init__(self, conn=None):
+        self.keys = {column: {} for column in DIMENSIONS}
+        self.next_key = {column: 1 for column in DIMENSIONS}
+        self.pending = {column: [] for column in DIMENSIONS}
+        if conn is not None:
+            self.load(conn)
+
+    def load(self, conn):
+        """Seed the lookup from existing dimension tables"""
+        for column, table in DIMENSIONS.items():
+            self.keys[column].update((name, key) for key, name in conn.execute(f"SELECT Id, Name FROM {table}"))
+            self.next_key[column] = max(self.keys[column].values(), default=0) + 1
+
+    def key(self, column, name):
+        """Key of a member, assigning the next one to a new name"""
+        keys = self.keys[column]
+        key = keys.get(name)
+        if key is None:
+            key = keys[name] = self.next_key[column]
+            self.next_key[column] += 1
+            self.pending[column].append((key, name))
+        return key
+
+    def encode(self, dataset, rows):
+        """Rows with every dimension name replaced by its key"""
+        lookups = [(position, self.keys[column], column) for position, column in dataset_dimensions(dataset)]
+        encoded = []
+        for row in rows:
+            row = list(row)
+            for position, keys, column in lookups:
+                row[position] = keys.get(row[position]) or self.key(column, row[position])
+            encoded.append(tuple(row))
+        return encoded
+
+    def flush(self, conn):
+        """Insert the members added since the last flush"""
+        for column, members in self.pending.items():
+            if members:
+                conn.executemany(f"INSERT INTO {DIMENSIONS[column]} (Id, Name) VALUES (?, ?)", members)
+                members.clear()
+
+
+def order_keys(conn, datasets=DATASETS):
+    """Renumber every dimension so that its keys sort the way its names do
+
+    Keys are handed out in the order names are first seen, so they are renumbered once
+    the facts are loaded. Sorted pages then order and resume on the small integer keys
+    and the fact indexes that hold them, yet show rows in name order. Keys move through
+    negative values so no primary key ever holds two rows with the same key midway.
+    """
+    for column, table in DIMENSIONS.items():
+        conn.execute("DROP TABLE IF EXISTS temp.key_order")
+        conn.execute("CREATE TEMP TABLE key_order (Old INTEGER PRIMARY KEY, New INTEGER NOT NULL)")
+        conn.execute(f"INSERT INTO key_order SELECT Id, ROW_NUMBER() OVER (ORDER BY Name) FROM {table}")
+        if conn.execute("SELECT COUNT(*) FROM key_order WHERE Old != New").fetchone()[0]:
+            targets = [(table, 'Id')] + [(fact_table(dataset), key_column(column)) for dataset in datasets
+                                         if column in [name for _, name in dataset_dimensions(dataset)]]
+            for target, key in targets:
+                conn.execute(f"UPDATE {target} SET {key} = -(SELECT New FROM key_order WHERE Old = {key})")
+                conn.execute(f"UPDATE {target} SET {key} = -{key}")
+        conn.execute("DROP TABLE temp.key_order")
+
+
+def keys_out_of_order(conn, column):
+    """Members of a dimension whose key does not follow name order (0 once order_keys ran)"""
+    return conn.execute(f"SELECT COUNT(*) FROM (SELECT Id, LAG(Id) OVER (ORDER BY Name) AS Previous "
+                        f"FROM {DIMENSIONS[column]}) WHERE Id < Previous").fetchone()[0]
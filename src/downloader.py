@@ -0,0 +1,157 @@
+import os
+import json
+import shutil
+import hashlib
+import requests
+from pathlib import Path
+
+DEFAULT_URL = "https://github.com/PhonePe/pulse/archive/refs/heads/master.zip"
+CHUNK_SIZE = 1 << 20
+KEEP_ARCHIVES = 2
+
+# Cache layout:
+#   <cache>/objects/<sha256>.zip   every archive we have fetched, named by content
+#   <cache>/download.part           bytes of an interrupted transfer
+#   <cache>/state.json             per URL: validators and sha256 of the last complete
+#                                  download, validators of the partial, and the build
+#                                  stamp (archive sha256 + schema) of each pipeline target
+STATE_FILE = 'state.json'
+PART_FILE = 'download.part'
+
+
+class ArchiveCache:
+    """Content-addressed store of downloaded archives with conditional, resumable fetches"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.objects = self.cache_dir / 'objects'
+        self.objects.mkdir(parents=True, exist_ok=True)
+
+    def load_state(self):
+        try:
+            return json.loads((self.cache_dir / STATE_FILE).read_text())
+        except FileNotFoundError:
+            return {}
+
+    def save_state(self, state):
+        tmp = self.cache_dir / f".{STATE_FILE}.tmp"
+        tmp.write_text(json.dumps(state, indent=2))
+        os.replace(tmp, self.cache_dir / STATE_FILE)
+
+    def object_path(self, sha256):
+        return self.objects / f"{sha256}.zip"
+
+    def fetch(self, url, attempts=3, timeout=60):
+        """Bring the cache up to date with url; returns (archive path, sha256, changed)
+
+        A cached archive is revalidated with If-None-Match / If-Modified-Since and a 304
+        costs no transfer. An interrupted transfer is resumed with a Range request, guarded
+        by If-Range so a partial file is never spliced onto a newer upstream archive.
+        changed is False when the upstream content is byte-identical to the last download.
+        """
+        entry = self.load_state().get(url, {})
+        cached = entry.get('sha256')
+        if cached and not self.object_path(cached).exists():
+            cached = None
+
+        for attempt in range(1, attempts + 1):
+            try:
+                result = self._transfer(url, entry if cached else {}, timeout)
+                break
+            except requests.RequestException as e:
+                if attempt == attempts:
+                    raise
+                print(f"⚠️ Download interrupted ({e}); resuming, attempt {attempt + 1}/{attempts}")
+
+        if result is None:
+            return self.object_path(cached), cached, False
+
+        sha256, validators = result
+        state = self.load_state()
+        entry = state.setdefault(url, {})
+        entry.update(validators, sha256=sha256)
+        entry.pop('partial', None)
+        self.save_state(state)
+        self.prune(keep=KEEP_ARCHIVES, protect=sha256)
+        return self.object_path(sha256), sha256, sha256 != cached
+
+    def _transfer(self, url, cached_entry, timeout):
+        """One request; None on 304, else (sha256, validators) of the completed archive"""
+        part_path = self.cache_dir / PART_FILE
+        state = self.load_state()
+        partial = state.get(url, {}).get('partial') or {}
+        offset = part_path.stat().st_size if part_path.exists() and partial else 0
+
+        headers = {}
+        if cached_entry.get('etag'):
+            headers['If-None-Match'] = cached_entry['etag']
+        elif cached_entry.get('last_modified'):
+            headers['If-Modified-Since'] = cached_entry['last_modified']
+        if offset:
+            headers['Range'] = f"bytes={offset}-"
+            headers['If-Range'] = partial.get('etag') or partial.get('last_modified', '')
+
+        with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
+            if response.status_code == 304:
+                # Upstream is still the cached archive, so any partial is obsolete
+                part_path.unlink(missing_ok=True)
+                return None
+            if response.status_code == 416:
+                # Our partial is not a prefix of anything the server has; start over
+                part_path.unlink(missing_ok=True)
+                raise requests.RequestException("range not satisfiable, restarting")
+            response.raise_for_status()
+
+            validators = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+            }
+            digest = hashlib.sha256()
+            if response.status_code == 206:
+                with open(part_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                        digest.update(chunk)
+                mode = 'ab'
+            else:
+                # A 200 carries the whole body: either no partial or the upstream changed
+                mode = 'wb'
+                state.setdefault(url, {})['partial'] = validators
+                self.save_state(state)
+
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
+                    digest.update(chunk)
+
+        sha256 = digest.hexdigest()
+        os.replace(part_path, self.object_path(sha256))
+        return sha256, validators
+
+    def prune(self, keep=KEEP_ARCHIVES, protect=None):
+        """Keep the newest `keep` archives (and `protect`), delete the rest"""
+        archives = sorted(self.objects.glob('*.zip'), key=lambda p: p.stat().st_mtime)
+        for old in archives[:-keep]:
+            if old.stem != protect:
+                old.unlink(missing_ok=True)
+
+    def built_from(self, url, target):
+        """Stamp recorded for `target`'s last build (archive sha256 and schema), if any"""
+        return self.load_state().get(url, {}).get('targets', {}).get(target)
+
+    def mark_built(self, url, target, stamp):
+        """Record that `target` now holds the build identified by stamp"""
+        state = self.load_state()
+        state.setdefault(url, {}).setdefault('targets', {})[target] = stamp
+        self.save_state(state)
+
+
+def place_archive(archive, destination):
+    """Expose a cached archive at destination via a hard link, copying across filesystems"""
+    destination = Path(destination)
+    tmp = destination.with_name(destination.name + '.tmp')
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(archive, tmp)
+    except OSError:
+        shutil.copyfile(archive, tmp)
+    os.replace(tmp, destination)
@@ -0,0 +1,401 @@
+import os
+import json
+import time
+import zipfile
+import functools
+import itertools
+import pandas as pd
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Decoder layer. orjson is several times faster than the stdlib on these files and is
+# used when installed; PHONEPE_JSON_DECODER=json forces the stdlib decoder.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DECODER = 'orjson' if orjson and os.environ.get('PHONEPE_JSON_DECODER', 'orjson') != 'json' else 'json'
+decode = orjson.loads if DECODER == 'orjson' else json.loads
+
+
+class SchemaError(ValueError):
+    """A source file that does not have its dataset's JSON shape"""
+
+
+# Each parser reads only the paths its columns come from; anything else in the
+# document is ignored. A missing key, an empty metric list or a wrong type surfaces as
+# SchemaError in parse_file.
+
+def parse_aggregated_transaction(data):
+    """Parse an aggregated/transaction state file"""
+    return [
+        (transaction['name'], transaction['paymentInstruments'][0]['count'],
+         transaction['paymentInstruments'][0]['amount'])
+        for transaction in data['transactionData']
+    ]
+
+
+def parse_aggregated_user(data):
+    """Parse an aggregated/user state file"""
+    return [
+        (device['brand'], device['count'], device['percentage'])
+        for device in data['usersByDevice'] or []
+    ]
+
+
+def parse_map_transaction(data):
+    """Parse a map/transaction (or map/insurance) hover file: one row per district"""
+    return [
+        (district['name'], district['metric'][0]['count'], district['metric'][0]['amount'])
+        for district in data['hoverDataList'] or []
+    ]
+
+
+def parse_map_user(data):
+    """Parse a map/user hover file: one row per district"""
+    return [
+        (district, metrics['registeredUsers'], metrics['appOpens'])
+        for district, metrics in (data['hoverData'] or {}).items()
+    ]
+
+
+def parse_top_transaction(data):
+    """Parse a top/transaction (or top/insurance) file: one row per pincode"""
+    # A handful of files report an unnamed pincode bucket; it has no key
+    return [
+        (int(pincode['entityName']), pincode['metric']['count'], pincode['metric']['amount'])
+        for pincode in data['pincodes'] or []
+        if pincode['entityName']
+    ]
+
+
+def parse_top_user(data):
+    """Parse a top/user file: one row per pincode"""
+    return [
+        (int(pincode['name']), pincode['registeredUsers'])
+        for pincode in data['pincodes'] or []
+        if pincode['name']
+    ]
+
+
+# Dataset name -> state folder (relative to pulse-master/data), columns, dtypes, parser,
+# and schema: the key under 'data' the parser reads and the container type it must hold
+DATASETS = {
+    'aggregated_transaction': {
+        'path': 'aggregated/transaction/country/india/state',
+        'columns': ['Transaction_type', 'Transaction_count', 'Transaction_amount'],
+        'dtypes': {'Transaction_count': 'int64', 'Transaction_amount': 'float64'},
+        'parser': parse_aggregated_transaction,
+        'schema': ('transactionData', list),
+    },
+    'aggregated_user': {
+        'path': 'aggregated/user/country/india/state',
+        'columns': ['Brands', 'Transaction_count', 'Percentage'],
+        'dtypes': {'Transaction_count': 'int64', 'Percentage': 'float64'},
+        'parser': parse_aggregated_user,
+        'schema': ('usersByDevice', list),
+    },
+    'aggregated_insurance': {
+        'path': 'aggregated/insurance/country/india/state',
+        'columns': ['Insurance_type', 'Insurance_count', 'Insurance_amount'],
+        'dtypes': {'Insurance_count': 'int64', 'Insurance_amount': 'float64'},
+        'parser': parse_aggregated_transaction,
+        'schema': ('transactionData', list),
+    },
+    'map_transaction': {
+        'path': 'map/transaction/hover/country/india/state',
+        'columns': ['District', 'Transaction_count', 'Transaction_amount'],
+        'dtypes': {'Transaction_count': 'int64', 'Transaction_amount': 'float64'},
+        'parser': parse_map_transaction,
+        'schema': ('hoverDataList', list),
+    },
+    'map_user': {
+        'path': 'map/user/hover/country/india/state',
+        'columns': ['District', 'RegisteredUsers', 'AppOpens'],
+        'dtypes': {'RegisteredUsers': 'int64', 'AppOpens': 'int64'},
+        'parser': parse_map_user,
+        'schema': ('hoverData', dict),
+    },
+    'map_insurance': {
+        'path': 'map/insurance/hover/country/india/state',
+        'columns': ['District', 'Insurance_count', 'Insurance_amount'],
+        'dtypes': {'Insurance_count': 'int64', 'Insurance_amount': 'float64'},
+        'parser': parse_map_transaction,
+        'schema': ('hoverDataList', list),
+    },
+    'top_transaction': {
+        'path': 'top/transaction/country/india/state',
+        'columns': ['Pincode', 'Transaction_count', 'Transaction_amount'],
+        'dtypes': {'Pincode': 'int64', 'Transaction_count': 'int64', 'Transaction_amount': 'float64'},
+        'parser': parse_top_transaction,
+        'schema': ('pincodes', list),
+    },
+    'top_user': {
+        'path': 'top/user/country/india/state',
+        'columns': ['Pincode', 'RegisteredUsers'],
+        'dtypes': {'Pincode': 'int64', 'RegisteredUsers': 'int64'},
+        'parser': parse_top_user,
+        'schema': ('pincodes', list),
+    },
+    'top_insurance': {
+        'path': 'top/insurance/country/india/state',
+        'columns': ['Pincode', 'Insurance_count', 'Insurance_amount'],
+        'dtypes': {'Pincode': 'int64', 'Insurance_count': 'int64', 'Insurance_amount': 'float64'},
+        'parser': parse_top_transaction,
+        'schema': ('pincodes', list),
+    },
+}
+
+KEY_COLUMNS = ['State', 'Year', 'Quarter']
+KEY_DTYPES = {'Year': 'int64', 'Quarter': 'int64'}
+
+
+@functools.lru_cache(maxsize=None)
+def state_name(folder_name):
+    """Turn a state folder name into the display name stored in the tables (memoized)"""
+    return folder_name.replace('-', ' ').title()
+
+
+class DirectorySource:
+    """Pulse JSON files read from an extracted pulse-master/data directory"""
+
+    def __init__(self, data_root):
+        self.data_root = Path(data_root)
+
+    def list_files(self, dataset):
+        """List (state, year, quarter, path) for a dataset; paths are relative to data_root"""
+        data_path = self.data_root / DATASETS[dataset]['path']
+        files = []
+
+        for state_folder in sorted(data_path.iterdir()):
+            if state_folder.is_dir():
+                state = state_name(state_folder.name)
+
+                for year_folder in sorted(state_folder.iterdir()):
+                    if year_folder.is_dir():
+                        year = int(year_folder.name)
+
+                        for json_file in sorted(year_folder.glob("*.json")):
+                            relative = json_file.relative_to(self.data_root).as_posix()
+                            files.append((state, year, int(json_file.stem), relative))
+
+        return files
+
+    def stat(self, path):
+        """(size, mtime) of a source file"""
+        stat = os.stat(self.data_root / path)
+        return stat.st_size, stat.st_mtime
+
+    def read(self, path):
+        """Raw bytes of a source file"""
+        with open(self.data_root / path, 'rb') as f:
+            return f.read()
+
+
+class ArchiveSource:
+    """Pulse JSON files streamed straight out of the downloaded master zip
+
+    Member names look like ``pulse-master/data/<dataset path>/<state>/<year>/<quarter>.json``;
+    everything up to and including ``data/`` is stripped so paths match DirectorySource.
+    """
+
+    def __init__(self, archive_path):
+        self.archive_path = Path(archive_path)
+        self._zip = None
+        self._pid = None
+        self._members = None
+
+    def __getstate__(self):
+        return {'archive_path': self.archive_path}
+
+    def __setstate__(self, state):
+        self.__init__(state['archive_path'])
+
+    def archive(self):
+        """Open the zip once per process; a handle inherited through fork shares its file offset"""
+        if self._zip is None or self._pid != os.getpid():
+            self._zip = zipfile.ZipFile(self.archive_path)
+            self._pid = os.getpid()
+        return self._zip
+
+    def members(self):
+        """{relative path: ZipInfo} for every file under the data/ folder"""
+        if self._members is None:
+            self._members = {}
+            for info in self.archive().infolist():
+                # Accept both the GitHub layout (pulse-master/data/...) and a bare data/... mirror
+                name = '/' + info.filename
+                root, sep, relative = name.partition('/data/')
+                if sep and root.count('/') <= 1 and not info.is_dir():
+                    self._members[relative] = info
+        return self._members
+
+    def list_files(self, dataset):
+        """List (state, year, quarter, path) for a dataset, in the same order as DirectorySource"""
+        prefix = DATASETS[dataset]['path'] + '/'
+        files = []
+
+        for relative in self.members():
+            if not relative.startswith(prefix):
+                continue
+            # Same shape the directory walk accepts: <state>/<year>/<quarter>.json
+            parts = relative[len(prefix):].split('/')
+            if len(parts) == 3 and parts[2].endswith('.json'):
+                state_folder, year, file_name = parts
+                files.append((state_name(state_folder), int(year), int(file_name[:-5]), relative,
+                              (state_folder, year, file_name)))
+
+        files.sort(key=lambda entry: entry[4])
+        return [entry[:4] for entry in files]
+
+    def stat(self, path):
+        """(size, mtime) of an archive member"""
+        info = self.members()[path]
+        return info.file_size, time.mktime(info.date_time + (0, 0, -1))
+
+    def read(self, path):
+        """Raw bytes of an archive member"""
+        return self.archive().read(self.members()[path])
+
+
+# Source used by pool workers, installed once per process by init_worker
+_worker_source = None
+
+
+def init_worker(source):
+    """ProcessPoolExecutor initializer"""
+    global _worker_source
+    _worker_source = source
+
+
+def check_schema(dataset, path, document):
+    """Return document['data'] after checking the envelope and the dataset's container
+
+    Only the top of the document is inspected, so the check costs a few dict lookups
+    per file; record-level problems are caught while the parser runs.
+    """
+    field, container = DATASETS[dataset]['schema']
+    data = document.get('data') if isinstance(document, dict) else None
+    if not isinstance(data, dict) or field not in data:
+        raise SchemaError(f"{path}: not a {dataset} file (missing data.{field})")
+    if data[field] is not None and not isinstance(data[field], container):
+        raise SchemaError(f"{path}: data.{field} should be a {container.__name__}, "
+                          f"got {type(data[field]).__name__}")
+    return data
+
+
+def parse_file(task, source=None):
+    """Parse one (dataset, state, year, quarter, path) task into table rows"""
+    dataset, state, year, quarter, path = task
+    data = check_schema(dataset, path, decode((source or _worker_source).read(path)))
+    try:
+        rows = DATASETS[dataset]['parser'](data)
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        raise SchemaError(f"{path}: malformed {dataset} record ({type(e).__name__}: {e})") from None
+    return [(state, year, quarter) + row for row in rows]
+
+
+def parse_chunk(tasks, source=None):
+    """Parse a list of tasks; one pool submission per chunk keeps IPC overhead low"""
+    return [parse_file(task, source) for task in tasks]
+
+
+def to_frame(dataset, rows):
+    """Build a typed DataFrame from parsed rows"""
+    df = pd.DataFrame(rows, columns=KEY_COLUMNS + DATASETS[dataset]['columns'])
+    return df.astype({**KEY_DTYPES, **DATASETS[dataset]['dtypes']})
+
+
+class IngestionEngine:
+    """Fan the Pulse JSON files out across a process pool and merge the rows"""
+
+    def __init__(self, source, workers=None, chunk_files=64, prefetch=2):
+        """source is a DirectorySource, an ArchiveSource, or a data directory path
+
+        chunk_files files go to a worker per submission and at most workers * prefetch
+        chunks are in flight, so parsed output never piles up ahead of the consumer.
+        """
+        if not isinstance(source, (DirectorySource, ArchiveSource)):
+            source = DirectorySource(source)
+        self.source = source
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_files = chunk_files
+        self.prefetch = prefetch
+
+    def tasks(self, dataset):
+        """Build the parse tasks for one dataset"""
+        return [(dataset,) + entry for entry in self.source.list_files(dataset)]
+
+    def iter_parsed(self, tasks):
+        """Yield (task, rows) in task order, serially or from a bounded process pool"""
+        chunks = [tasks[start:start + self.chunk_files] for start in range(0, len(tasks), self.chunk_files)]
+        if self.workers <= 1 or len(chunks) < 2:
+            for task in tasks:
+                yield task, parse_file(task, self.source)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                 initargs=(self.source,)) as executor:
+            remaining = iter(chunks)
+            pending = deque(
+                (chunk, executor.submit(parse_chunk, chunk))
+                for chunk in itertools.islice(remaining, self.workers * self.prefetch)
+            )
+            while pending:
+                chunk, future = pending.popleft()
+                parsed = future.result()
+                next_chunk = next(remaining, None)
+                if next_chunk is not None:
+                    pending.append((next_chunk, executor.submit(parse_chunk, next_chunk)))
+                yield from zip(chunk, parsed)
+
+    def parse_tasks(self, tasks):
+        """Parse tasks serially or on a process pool, preserving task order"""
+        return [rows for _, rows in self.iter_parsed(tasks)]
+
+    def iter_batches(self, datasets, batch_size=50000):
+        """Stream (dataset, rows) batches of at most batch_size rows, in file order
+
+        Memory stays bounded by the batch buffers and the in-flight chunks, however
+        many files or quarters are ingested.
+        """
+        tasks = []
+        for dataset in datasets:
+            tasks.extend(self.tasks(dataset))
+
+        buffers = {dataset: [] for dataset in datasets}
+        for task, file_rows in self.iter_parsed(tasks):
+            buffer = buffers[task[0]]
+            buffer.extend(file_rows)
+            if len(buffer) >= batch_size:
+                yield task[0], buffer[:batch_size]
+                del buffer[:batch_size]
+
+        for dataset, buffer in buffers.items():
+            while buffer:
+                yield dataset, buffer[:batch_size]
+                del buffer[:batch_size]
+
+    def extract_rows(self, datasets):
+        """Extract several datasets through one pool, returning {dataset: [row tuples]}"""
+        tasks = []
+        for dataset in datasets:
+            tasks.extend(self.tasks(dataset))
+
+        rows = {dataset: [] for dataset in datasets}
+        for task, file_rows in zip(tasks, self.parse_tasks(tasks)):
+            rows[task[0]].extend(file_rows)
+
+        return rows
+
+    def extract_many(self, datasets):
+        """Extract several datasets through one pool, returning {dataset: DataFrame}"""
+        rows = self.extract_rows(datasets)
+        return {dataset: to_frame(dataset, rows[dataset]) for dataset in datasets}
+
+    def extract(self, dataset):
+        """Extract one dataset into a DataFrame"""
+        return self.extract_many([dataset])[dataset]
@@ -0,0 +1,67 @@
+import hashlib
+
+MANIFEST_TABLE = 'ingest_manifest'
+MANIFEST_COLUMNS = ['Path', 'Dataset', 'State', 'Year', 'Quarter', 'Size', 'Mtime', 'Sha1']
+
+
+def file_hash(source, path):
+    """SHA-1 of a source file's contents"""
+    return hashlib.sha1(source.read(path)).hexdigest()
+
+
+def scan_files(source, datasets):
+    """Stat every source file of the given datasets, keyed by path relative to the data root"""
+    files = {}
+
+    for dataset in datasets:
+        for state, year, quarter, path in source.list_files(dataset):
+            size, mtime = source.stat(path)
+            files[path] = {
+                'Path': path,
+                'Dataset': dataset,
+                'State': state,
+                'Year': year,
+                'Quarter': quarter,
+                'Size': size,
+                'Mtime': mtime,
+                'Sha1': None,
+            }
+
+    return files
+
+
+def diff_manifest(previous, source, datasets):
+    """Compare a DirectorySource/ArchiveSource against a previous manifest ({path: row})
+
+    Returns (changed, removed, touched):
+      changed - new files or files whose content hash differs
+      removed - manifest rows whose file no longer exists
+      touched - files with a new mtime but identical content (manifest refresh only)
+
+    Files whose size and mtime both match the manifest are not re-hashed.
+    """
+    current = scan_files(source, datasets)
+    changed, touched = [], []
+
+    for path, row in current.items():
+        old = previous.get(path)
+        if old is not None and old['Size'] == row['Size'] and old['Mtime'] == row['Mtime']:
+            continue
+
+        row['Sha1'] = file_hash(source, path)
+        if old is None or old['Size'] != row['Size'] or old['Sha1'] != row['Sha1']:
+            changed.append(row)
+        else:
+            touched.append(row)
+
+    removed = [
+        row for path, row in previous.items()
+        if path not in current and row['Dataset'] in datasets
+    ]
+
+    return changed, removed, touched
+
+
+def manifest_record(row):
+    """Manifest table values for a scanned row"""
+    return [row[column] for column in MANIFEST_COLUMNS]
@@ -0,0 +1,187 @@
+import os
+import sys
+import json
+import time
+import threading
+import functools
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Finished spans kept in memory for the dashboard perf panel and the metrics endpoint
+RECENT = deque(maxlen=1000)
+_lock = threading.Lock()
+
+# PHONEPE_PERF_LOG=<path> appends every span as one JSON line ('-' = stderr)
+LOG_PATH = os.environ.get('PHONEPE_PERF_LOG')
+
+
+PAGE_MB = os.sysconf('SC_PAGE_SIZE') / 2**20
+
+# While any span is open a sampler thread reads RSS this often, so each span can report
+# the highest resident memory seen while it ran (PHONEPE_PERF_SAMPLE_MS=<ms>)
+SAMPLE_INTERVAL = float(os.environ.get('PHONEPE_PERF_SAMPLE_MS', '5')) / 1000
+
+
+def rss_mb():
+    """Current resident set size of this process in MB, None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return round(int(f.read().split()[1]) * PAGE_MB, 1)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class PeakSampler:
+    """Track the peak RSS of every open span from one background thread
+
+    Resetting the kernel's high-water mark (/proc/self/clear_refs) would be exact, but it
+    is process-wide: a nested or concurrent span would wipe the peak of the spans around
+    it. Sampling serves any number of overlapping spans; a spike shorter than the
+    interval can fall between two samples.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self._peaks = {}  # open span token -> highest RSS sampled so far
+        self._tokens = 0
+        self._changed = threading.Condition()
+        self._pid = None
+
+    def open(self, rss):
+        """Start tracking a span that entered at `rss` MB; returns its token"""
+        with self._changed:
+            if self._pid != os.getpid():
+                # First span in this process (or in a forked child, which has no sampler)
+                self._pid = os.getpid()
+                threading.Thread(target=self._run, name='perf-sampler', daemon=True).start()
+            self._tokens += 1
+            self._peaks[self._tokens] = rss
+            self._changed.notify()
+            return self._tokens
+
+    def close(self, token, rss):
+        """Stop tracking a span that exited at `rss` MB; returns its peak"""
+        with self._changed:
+            peak = self._peaks.pop(token)
+        return peak if rss is None else max(peak, rss)
+
+    def _run(self):
+        while True:
+            with self._changed:
+                while not self._peaks:
+                    self._changed.wait()
+            rss = rss_mb()
+            with self._changed:
+                for token, peak in self._peaks.items():
+                    if rss is not None and rss > peak:
+                        self._peaks[token] = rss
+            time.sleep(self.interval)
+
+
+SAMPLER = PeakSampler()
+
+
+def emit(record):
+    """Store a finished span and write it to the JSON log if one is configured"""
+    with _lock:
+        RECENT.append(record)
+        if LOG_PATH == '-':
+            print(json.dumps(record), file=sys.stderr)
+        elif LOG_PATH:
+            with open(LOG_PATH, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+
+
+@contextmanager
+def span(name, **fields):
+    """Time a named block; set record['rows'] inside it to report rows processed
+
+        with span('extract', dataset='map_user') as record:
+            rows = ...
+            record['rows'] = len(rows)
+    """
+    record = {'span': name, **fields}
+    rss_before = rss_mb()
+    token = SAMPLER.open(rss_before) if rss_before is not None else None
+    started = time.perf_counter()
+    try:
+        yield record
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record['seconds'] = round(time.perf_counter() - started, 6)
+        # All of this span's own: resident memory at exit, the highest seen while it
+        # ran, and how far that peak rose above where the span started
+        record['rss_mb'] = rss_mb()
+        if token is not None:
+            record['peak_rss_mb'] = SAMPLER.close(token, record['rss_mb'])
+            record['peak_growth_mb'] = round(record['peak_rss_mb'] - rss_before, 1)
+        record['at'] = time.time()
+        emit(record)
+
+
+def traced(name):
+    """Decorator form of span(); rows is taken from the result's length when it has one"""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name) as record:
+                result = function(*args, **kwargs)
+                if hasattr(result, '__len__'):
+                    record['rows'] = len(result)
+                return result
+        return wrapper
+    return decorate
+
+
+def recent(limit=None):
+    """Most recent spans, newest first"""
+    with _lock:
+        records = list(RECENT)
+    records.reverse()
+    return records[:limit] if limit else records
+
+
+def summary():
+    """Per-span count, total, mean and max seconds over the recent window"""
+    stats = {}
+    for record in recent():
+        entry = stats.setdefault(record['span'], {'count': 0, 'total_s': 0.0, 'max_s': 0.0})
+        entry['count'] += 1
+        entry['total_s'] += record['seconds']
+        entry['max_s'] = max(entry['max_s'], record['seconds'])
+    for entry in stats.values():
+        entry['mean_s'] = round(entry['total_s'] / entry['count'], 6)
+        entry['total_s'] = round(entry['total_s'], 6)
+    return stats
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics -> span summary, GET /spans -> recent spans (JSON)"""
+
+    def do_GET(self):
+        if self.path.startswith('/metrics'):
+            body = summary()
+        elif self.path.startswith('/spans'):
+            body = recent(200)
+        else:
+            self.send_error(404)
+            return
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port, host='127.0.0.1'):
+    """Serve /metrics and /spans on a local port from a daemon thread"""
+    server = ThreadingHTTPServer((host, int(port)), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='perf-metrics', daemon=True).start()
+    return server
@@ -0,0 +1,172 @@
+"""Long-running refresh of the dashboard database
+
+Every interval, and whenever it is triggered, the service runs the regular
+PhonePeDataSetup SQLite build: fetch the archive (a 304 when upstream is unchanged),
+stream it into '<db>.building', validate the new file and atomically rename it over
+the live database. Dashboards keep serving the old file until the rename and reopen on
+their next query after it, so there is never a half-loaded table or a read stall.
+
+A refresh is triggered early by SIGHUP or by touching the trigger file:
+
+    python src/refresh_service.py --interval 21600 --trigger-file Data/refresh.trigger
+    kill -HUP <pid>                        # or: touch Data/refresh.trigger
+    python src/refresh_service.py --once   # one validated refresh, e.g. from cron
+
+The outcome of the last attempt is written to '<db>.refresh.json'.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+from ingestion import DATASETS
+from sqlite_store import BuildValidationError
+from setup_database import PhonePeDataSetup
+from perf import span, start_metrics_server
+
+DEFAULT_INTERVAL = int(os.environ.get('PHONEPE_REFRESH_INTERVAL', 6 * 3600))
+# Reject a build in which any table lost more than this fraction of its live rows; Pulse
+# releases only ever add quarters, so a shrinking table means a truncated or broken source
+MAX_SHRINK = float(os.environ.get('PHONEPE_REFRESH_MAX_SHRINK', '0.1'))
+# How often the wait between refreshes looks at the trigger file
+POLL_SECONDS = 5
+
+
+def live_state(db_path):
+    """(build version, {table: rows}) of the database currently at db_path"""
+    if not Path(db_path).exists():
+        return None, {}
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        # Datasets are views over the fact tables from schema version 4 on
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")}
+        version = None
+        if 'build_info' in tables:
+            row = conn.execute("SELECT Value FROM build_info WHERE Key = 'version'").fetchone()
+            version = row[0] if row else None
+        counts = {dataset: conn.execute(f"SELECT COUNT(*) FROM {dataset}").fetchone()[0]
+                  for dataset in DATASETS if dataset in tables}
+        return version, counts
+    finally:
+        conn.close()
+
+
+class RefreshService:
+    """Rebuild the database on a schedule or on demand and swap it in once validated"""
+
+    def __init__(self, setup, db_path='phonepe_data.db', interval=DEFAULT_INTERVAL,
+                 max_shrink=MAX_SHRINK, trigger_path=None):
+        self.setup = setup
+        self.db_path = Path(db_path)
+        self.interval = interval
+        self.max_shrink = max_shrink
+        self.trigger_path = Path(trigger_path) if trigger_path else None
+        self.status_path = self.db_path.with_name(self.db_path.name + '.refresh.json')
+        self._requested = threading.Event()
+        self._stopping = threading.Event()
+        self._trigger_mtime = self.trigger_mtime()
+
+    def check_counts(self, build_path, counts):
+        """Veto a build whose tables shrank against the live database"""
+        _, live = live_state(self.db_path)
+        shrunk = [f"{table}: {counts.get(table, 0)} rows, live has {rows}"
+                  for table, rows in live.items()
+                  if rows and counts.get(table, 0) < rows * (1 - self.max_shrink)]
+        if shrunk:
+            raise BuildValidationError(f"{build_path} lost rows: {'; '.join(shrunk)}")
+
+    def refresh(self):
+        """One build attempt; True when the database is current afterwards"""
+        before, _ = live_state(self.db_path)
+        with span('refresh') as record:
+            ok = self.setup.build_sqlite(str(self.db_path), check=self.check_counts)
+            after, counts = live_state(self.db_path)
+            record.update(ok=ok, swapped=after != before, version=after)
+        self.write_status({
+            'at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'ok': ok,
+            'swapped': after != before,
+            'version': after,
+            'previous_version': before,
+            'counts': counts,
+            'seconds': record['seconds'],
+        })
+        if ok and after != before:
+            print(f"🔄 Swapped in {self.db_path} version {after} (was {before})")
+        return ok
+
+    def write_status(self, status):
+        tmp = self.status_path.with_name(f".{self.status_path.name}.tmp")
+        tmp.write_text(json.dumps(status, indent=2))
+        os.replace(tmp, self.status_path)
+
+    def trigger_mtime(self):
+        try:
+            return self.trigger_path.stat().st_mtime_ns if self.trigger_path else None
+        except FileNotFoundError:
+            return None
+
+    def request(self, *_):
+        """Ask for a refresh as soon as the current wait or build is over (SIGHUP)"""
+        self._requested.set()
+
+    def stop(self, *_):
+        """Leave the loop after the current build (SIGTERM / SIGINT)"""
+        self._stopping.set()
+        self._requested.set()
+
+    def wait(self):
+        """Sleep until the next scheduled refresh, a request or the trigger file changes"""
+        deadline = time.monotonic() + self.interval
+        while not self._stopping.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._requested.wait(min(POLL_SECONDS, remaining)):
+                break
+            mtime = self.trigger_mtime()
+            if mtime != self._trigger_mtime:
+                self._trigger_mtime = mtime
+                break
+        self._requested.clear()
+
+    def run(self):
+        """Refresh now, then on every interval or trigger until stopped"""
+        while not self._stopping.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"❌ Refresh failed: {e}")
+            self.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default='phonepe_data.db')
+    parser.add_argument('--interval', type=int, default=DEFAULT_INTERVAL, help="seconds between refreshes")
+    parser.add_argument('--trigger-file', help="touch this file to refresh right away")
+    parser.add_argument('--max-shrink', type=float, default=MAX_SHRINK,
+                        help="largest fraction of a table's rows a refresh may drop")
+    parser.add_argument('--once', action='store_true', help="refresh once and exit (non-zero on failure)")
+    args = parser.parse_args()
+
+    # Same environment as setup_database.py: PHONEPE_WORKERS, PHONEPE_ARCHIVE,
+    # PHONEPE_SOURCE_URL, PHONEPE_CACHE_DIR and PHONEPE_METRICS_PORT
+    if os.environ.get('PHONEPE_METRICS_PORT'):
+        start_metrics_server(os.environ['PHONEPE_METRICS_PORT'])
+    workers = int(os.environ['PHONEPE_WORKERS']) if os.environ.get('PHONEPE_WORKERS') else None
+    setup = PhonePeDataSetup(None, workers=workers, archive_path=os.environ.get('PHONEPE_ARCHIVE'),
+                             source_url=os.environ.get('PHONEPE_SOURCE_URL'),
+                             cache_dir=os.environ.get('PHONEPE_CACHE_DIR'))
+    service = RefreshService(setup, args.db, args.interval, args.max_shrink, args.trigger_file)
+
+    if args.once:
+        sys.exit(0 if service.refresh() else 1)
+
+    signal.signal(signal.SIGHUP, service.request)
+    signal.signal(signal.SIGTERM, service.stop)
+    signal.signal(signal.SIGINT, service.stop)
+    print(f"🕒 Refreshing {args.db} every {args.interval}s (pid {os.getpid()}, SIGHUP to refresh now)")
+    service.run()
@@ -0,0 +1,163 @@
+"""Materialized rollups of the aggregated tables for the dashboard
+
+rollup_cube holds every measure summed per (dimension member, Year, Quarter) at three
+grains: a single quarter, a whole year (Quarter = 0) and all time (Year = 0, Quarter = 0).
+Dimension 'All' (Member '') holds the grand totals. rollup_topn keeps the top TOP_N
+members of each (measure, dimension, period) ranked by value. rollup_series turns the
+quarter grain into one time series per (measure, dimension member) with QoQ and YoY
+growth, a four-quarter rolling average, the member's rank in each quarter and how
+that rank moved since the previous quarter, all computed with window functions.
+
+The statements are plain SQL that runs unchanged on SQLite and MySQL 8, so every load
+path can rebuild the rollups from whatever base tables it just wrote. With keyed=True
+they read the integer-keyed fact tables of the SQLite store instead (see dimensions.py):
+groups are formed on the small integer keys and each group's name is joined on after.
+"""
+from dimensions import DIMENSIONS, fact_table, key_column
+
+CUBE_TABLE = 'rollup_cube'
+TOPN_TABLE = 'rollup_topn'
+SERIES_TABLE = 'rollup_series'
+TOP_N = 10
+ROLLING_QUARTERS = 4
+
+# Source table -> dimensions and measures to roll up ('Records' is the row count)
+ROLLUPS = {
+    'aggregated_transaction': {
+        'dimensions': ['State', 'Transaction_type'],
+        'measures': ['Transaction_count', 'Transaction_amount', 'Records'],
+    },
+    'aggregated_user': {
+        'dimensions': ['State', 'Brands'],
+        'measures': ['Transaction_count', 'Records'],
+    },
+    'aggregated_insurance': {
+        'dimensions': ['State', 'Insurance_type'],
+        'measures': ['Insurance_count', 'Insurance_amount', 'Records'],
+    },
+}
+
+# Grain -> (Year expression, Quarter expression, GROUP BY columns)
+GRAINS = {
+    'quarter': ('Year', 'Quarter', ['Year', 'Quarter']),
+    'year': ('Year', '0', ['Year']),
+    'all': ('0', '0', []),
+}
+
+CREATE_SQL = [
+    f"""CREATE TABLE IF NOT EXISTS {CUBE_TABLE} (
+    Source VARCHAR(50),
+    Measure VARCHAR(50),
+    Dimension VARCHAR(50),
+    Year INT,
+    Quarter INT,
+    Member VARCHAR(100),
+    Value DOUBLE,
+    PRIMARY KEY (Source, Measure, Dimension, Year, Quarter, Member)
+)""",
+    f"""CREATE TABLE IF NOT EXISTS {TOPN_TABLE} (
+    Source VARCHAR(50),
+    Measure VARCHAR(50),
+    Dimension VARCHAR(50),
+    Year INT,
+    Quarter INT,
+    Position INT,
+    Member VARCHAR(100),
+    Value DOUBLE,
+    PRIMARY KEY (Source, Measure, Dimension, Year, Quarter, Position)
+)""",
+    f"""CREATE TABLE IF NOT EXISTS {SERIES_TABLE} (
+    Source VARCHAR(50),
+    Measure VARCHAR(50),
+    Dimension VARCHAR(50),
+    Member VARCHAR(100),
+    Year INT,
+    Quarter INT,
+    Value DOUBLE,
+    QoQ DOUBLE,
+    YoY DOUBLE,
+    Rolling_avg DOUBLE,
+    Position INT,
+    Position_change INT,
+    PRIMARY KEY (Source, Measure, Dimension, Member, Year, Quarter)
+)""",
+]
+
+
+def cube_select(source, measure, dimension, grain, keyed=False):
+    """SELECT producing cube rows for one (source, measure, dimension, grain)"""
+    year, quarter, group_by = GRAINS[grain]
+    value = 'COUNT(*)' if measure == 'Records' else f"COALESCE(SUM({measure}), 0)"
+    if keyed and dimension in DIMENSIONS:
+        key, names = key_column(dimension), DIMENSIONS[dimension]
+        grouped = (f"SELECT {key} AS Id, {year} AS Year, {quarter} AS Quarter, {value} AS Value "
+                   f"FROM {fact_table(source)} GROUP BY {', '.join([key] + group_by)}")
+        return (f"SELECT '{source}', '{measure}', '{dimension}', grouped.Year, grouped.Quarter, "
+                f"{names}.Name, grouped.Value FROM ({grouped}) grouped JOIN {names} ON {names}.Id = grouped.Id")
+    member = dimension if dimension != 'All' else "''"
+    if dimension != 'All':
+        group_by = [dimension] + group_by
+    group = f" GROUP BY {', '.join(group_by)}" if group_by else ""
+    return (f"SELECT '{source}', '{measure}', '{dimension}', {year}, {quarter}, {member}, {value} "
+            f"FROM {fact_table(source) if keyed else source}{group}")
+
+
+def refresh_statements(sources=None, keyed=False):
+    """SQL statements that rebuild the rollup tables from the base tables
+
+    Only DELETEs and INSERTs, so they can run inside the caller's transaction: MySQL
+    commits implicitly on DDL. The tables must already exist (see CREATE_SQL).
+    """
+    statements = [f"DELETE FROM {table}" for table in (CUBE_TABLE, TOPN_TABLE, SERIES_TABLE)]
+
+    for source in sources or ROLLUPS:
+        spec = ROLLUPS[source]
+        for measure in spec['measures']:
+            for dimension in ['All'] + spec['dimensions']:
+                for grain in GRAINS:
+                    statements.append(
+                        f"INSERT INTO {CUBE_TABLE} (Source, Measure, Dimension, Year, Quarter, Member, Value) "
+                        + cube_select(source, measure, dimension, grain, keyed)
+                    )
+
+    statements.append(f"""INSERT INTO {TOPN_TABLE} (Source, Measure, Dimension, Year, Quarter, Position, Member, Value)
+SELECT Source, Measure, Dimension, Year, Quarter, Position, Member, Value FROM (
+    SELECT Source, Measure, Dimension, Year, Quarter, Member, Value,
+           ROW_NUMBER() OVER (PARTITION BY Source, Measure, Dimension, Year, Quarter
+                              ORDER BY Value DESC, Member) AS Position
+    FROM {CUBE_TABLE} WHERE Dimension <> 'All'
+) ranked WHERE Position <= {TOP_N}""")
+    statements.append(series_insert())
+    return statements
+
+
+def series_insert():
+    """INSERT building rollup_series from the quarter grain of rollup_cube
+
+    Period numbers quarters consecutively, and every window frames on it rather than on
+    rows: the previous quarter is the row exactly 1 period back, the same quarter a year
+    ago exactly 4 back, and the rolling average covers the periods within the last four.
+    A member missing from some quarters therefore gets NULL growth (and no rank change)
+    only where the quarter compared against is missing, and its average never reaches
+    further back across a gap.
+    """
+    return f"""INSERT INTO {SERIES_TABLE} (Source, Measure, Dimension, Member, Year, Quarter, Value,
+                             QoQ, YoY, Rolling_avg, Position, Position_change)
+SELECT Source, Measure, Dimension, Member, Year, Quarter, Value,
+       Value / NULLIF(Prev_value, 0) - 1,
+       Value / NULLIF(Year_ago_value, 0) - 1,
+       Rolling_avg, Position, Prev_position - Position
+FROM (
+    SELECT ranked.*,
+           MAX(Value) OVER (member_periods RANGE BETWEEN 1 PRECEDING AND 1 PRECEDING) AS Prev_value,
+           MAX(Position) OVER (member_periods RANGE BETWEEN 1 PRECEDING AND 1 PRECEDING) AS Prev_position,
+           MAX(Value) OVER (member_periods RANGE BETWEEN 4 PRECEDING AND 4 PRECEDING) AS Year_ago_value,
+           AVG(Value) OVER (member_periods RANGE BETWEEN {ROLLING_QUARTERS - 1} PRECEDING AND CURRENT ROW)
+               AS Rolling_avg
+    FROM (
+        SELECT Source, Measure, Dimension, Member, Year, Quarter, Value, Year * 4 + Quarter AS Period,
+               RANK() OVER (PARTITION BY Source, Measure, Dimension, Year, Quarter ORDER BY Value DESC) AS Position
+        FROM {CUBE_TABLE} WHERE Year > 0 AND Quarter > 0 AND Measure <> 'Records'
+    ) ranked
+    WINDOW member_periods AS (PARTITION BY Source, Measure, Dimension, Member ORDER BY Period)
+) framed"""
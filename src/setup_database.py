@@ -1,54 +1,104 @@
 import os
-import json
+import sys
 import pandas as pd
 import mysql.connector
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, create_engine, text
 from urllib.parse import quote_plus
-import requests
+import shutil
 import zipfile
 from pathlib import Path
+from ingestion import DATASETS, KEY_COLUMNS, ArchiveSource, DirectorySource, IngestionEngine, to_frame
+from sqlite_store import SCHEMA_VERSION, build_database, file_schema_version, new_version
+from snapshot import SnapshotWriter
+from rollups import CREATE_SQL, refresh_statements
+from perf import span, start_metrics_server, traced
+from downloader import DEFAULT_URL, ArchiveCache, place_archive
+from manifest import MANIFEST_TABLE, MANIFEST_COLUMNS, diff_manifest, manifest_record
 
 class PhonePeDataSetup:
-    def __init__(self, mysql_config):
-        """Initialize with MySQL configuration"""
+    def __init__(self, mysql_config, workers=None, archive_path=None, source_url=None, cache_dir=None):
+        """Initialize with MySQL configuration and parser worker count (default: all cores)
+        
+        With archive_path set, the master zip is kept at that path (or used as a local
+        mirror) and JSON members are streamed out of it instead of being extracted.
+        source_url replaces the GitHub archive URL (e.g. a local mirror); downloaded
+        archives are cached by content under cache_dir (default: Data/cache).
+        """
         self.mysql_config = mysql_config
+        self.workers = workers
+        self.archive_path = Path(archive_path) if archive_path else None
+        self.source_url = source_url or DEFAULT_URL
         self.data_dir = Path("Data")
         self.data_dir.mkdir(exist_ok=True)
+        self.cache = ArchiveCache(cache_dir or self.data_dir / "cache")
+        # sha256 of the archive fetched by this run; None until download_phonepe_data runs
+        self.archive_sha256 = None
         
-    def download_phonepe_data(self):
-        """Download PhonePe Pulse data from GitHub"""
-        print("📥 Downloading PhonePe Pulse data...")
+    def data_source(self):
+        """Where the extractors read JSON from: the zip archive or the extracted tree"""
+        if self.archive_path:
+            return ArchiveSource(self.archive_path)
+        return DirectorySource(self.data_dir / "pulse-master/data")
         
-        # GitHub repository URL
-        repo_url = "https://github.com/PhonePe/pulse/archive/refs/heads/master.zip"
-        zip_path = self.data_dir / "phonepe_data.zip"
+    @traced('download')
+    def download_phonepe_data(self):
+        """Download PhonePe Pulse data, reusing the cached archive when upstream is unchanged"""
+        print(f"📥 Checking {self.source_url}...")
         
         try:
-            # Download the zip file
-            response = requests.get(repo_url, stream=True)
-            response.raise_for_status()
+            archive, sha256, changed = self.cache.fetch(self.source_url)
+            self.archive_sha256 = sha256
+            print("✅ Download complete!" if changed else "✅ Upstream unchanged, using the cached archive")
             
-            with open(zip_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Archive mode: the extractors stream members straight out of the zip
+            if self.archive_path:
+                place_archive(archive, self.archive_path)
+                return True
             
-            print("✅ Download complete!")
+            # The extracted tree remembers which archive it came from
+            extracted = self.data_dir / "pulse-master"
+            marker = extracted / ".archive-sha256"
+            if marker.exists() and marker.read_text().strip() == sha256:
+                print("✅ Extracted data is already current")
+                return True
             
-            # Extract the zip file
+            # Extract beside the live tree and swap it in, so files removed upstream go too
             print("📦 Extracting data...")
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(self.data_dir)
+            staging = self.data_dir / ".extracting"
+            shutil.rmtree(staging, ignore_errors=True)
+            with zipfile.ZipFile(archive, 'r') as zip_ref:
+                zip_ref.extractall(staging)
+            shutil.rmtree(extracted, ignore_errors=True)
+            (staging / "pulse-master").rename(extracted)
+            shutil.rmtree(staging, ignore_errors=True)
+            marker.write_text(sha256)
             
             print("✅ Extraction complete!")
-            
-            # Remove zip file
-            zip_path.unlink()
-            
             return True
         except Exception as e:
             print(f"❌ Error downloading data: {e}")
             return False
     
+    def build_stamp(self):
+        """What a target built by this code from the downloaded archive is recorded as
+        
+        The schema version is part of it, so upgrading to code with a new layout or new
+        rollups rebuilds the targets even when upstream has not changed.
+        """
+        return f"{self.archive_sha256}/schema-{SCHEMA_VERSION}"
+    
+    def is_current(self, target):
+        """True when `target` was last built by this schema from the archive this run downloaded"""
+        return bool(self.archive_sha256) and self.cache.built_from(self.source_url, target) == self.build_stamp()
+    
+    def mark_current(self, target):
+        """Record the downloaded archive and this schema as the contents of `target`"""
+        if self.archive_sha256:
+            self.cache.mark_built(self.source_url, target, self.build_stamp())
+    
+    def mysql_target(self):
+        return f"mysql:{self.mysql_config['host']}/{self.mysql_config['database']}"
+    
     def create_database(self):
         """Create PhonePe database if it doesn't exist"""
         print("\n🗄️ Creating database...")
@@ -162,6 +212,65 @@ class PhonePeDataSetup:
                 )
                 """))
                 
+                # Aggregated Insurance Table
+                conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS aggregated_insurance (
+                    State VARCHAR(100),
+                    Year INT,
+                    Quarter INT,
+                    Insurance_type VARCHAR(100),
+                    Insurance_count BIGINT,
+                    Insurance_amount DOUBLE,
+                    PRIMARY KEY (State, Year, Quarter, Insurance_type)
+                )
+                """))
+                
+                # Map Insurance Table
+                conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS map_insurance (
+                    State VARCHAR(100),
+                    Year INT,
+                    Quarter INT,
+                    District VARCHAR(100),
+                    Insurance_count BIGINT,
+                    Insurance_amount DOUBLE,
+                    PRIMARY KEY (State, Year, Quarter, District)
+                )
+                """))
+                
+                # Top Insurance Table
+                conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS top_insurance (
+                    State VARCHAR(100),
+                    Year INT,
+                    Quarter INT,
+                    Pincode INT,
+                    Insurance_count BIGINT,
+                    Insurance_amount DOUBLE,
+                    PRIMARY KEY (State, Year, Quarter, Pincode)
+                )
+                """))
+                
+                # Source file manifest for incremental refreshes
+                conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+                    Path VARCHAR(255),
+                    Dataset VARCHAR(50),
+                    State VARCHAR(100),
+                    Year INT,
+                    Quarter INT,
+                    Size BIGINT,
+                    Mtime DOUBLE,
+                    Sha1 CHAR(40),
+                    PRIMARY KEY (Path)
+                )
+                """))
+                
+                # Rollup tables the dashboard reads; created here because refreshes
+                # rebuild them inside a transaction, where DDL would commit it early
+                for statement in CREATE_SQL:
+                    conn.execute(text(statement))
+                
                 conn.commit()
                 
             print("✅ All tables created successfully!")
@@ -170,39 +279,21 @@ class PhonePeDataSetup:
         except Exception as e:
             print(f"❌ Error creating tables: {e}")
             return False 
+    def extract_datasets(self, datasets):
+        """Extract several datasets in one pass over the process pool"""
+        engine = IngestionEngine(self.data_source(), workers=self.workers)
+        print(f"\n⚙️ Parsing {', '.join(datasets)} with {engine.workers} worker(s)...")
+        with span('extract', datasets=','.join(datasets), workers=engine.workers) as record:
+            frames = engine.extract_many(datasets)
+            record['rows'] = sum(len(df) for df in frames.values())
+        return frames
+    
     def extract_aggregated_transaction(self):
         """Extract aggregated transaction data from JSON files"""
         print("\n📊 Processing aggregated transaction data...")
         
-        data_list = []
-        data_path = self.data_dir / "pulse-master/data/aggregated/transaction/country/india/state"
-        
         try:
-            for state_folder in data_path.iterdir():
-                if state_folder.is_dir():
-                    state = state_folder.name
-                    
-                    for year_folder in state_folder.iterdir():
-                        if year_folder.is_dir():
-                            year = year_folder.name
-                            
-                            for json_file in year_folder.glob("*.json"):
-                                quarter = json_file.stem
-                                
-                                with open(json_file, 'r') as f:
-                                    data = json.load(f)
-                                    
-                                    for transaction in data['data']['transactionData']:
-                                        data_list.append({
-                                            'State': state.replace('-', ' ').title(),
-                                            'Year': int(year),
-                                            'Quarter': int(quarter),
-                                            'Transaction_type': transaction['name'],
-                                            'Transaction_count': transaction['paymentInstruments'][0]['count'],
-                                            'Transaction_amount': transaction['paymentInstruments'][0]['amount']
-                                        })
-            
-            df = pd.DataFrame(data_list)
+            df = self.extract_datasets(['aggregated_transaction'])['aggregated_transaction']
             print(f"✅ Extracted {len(df)} transaction records")
             return df
             
@@ -214,36 +305,8 @@ class PhonePeDataSetup:
         """Extract aggregated user data from JSON files"""
         print("\n👥 Processing aggregated user data...")
         
-        data_list = []
-        data_path = self.data_dir / "pulse-master/data/aggregated/user/country/india/state"
-        
         try:
-            for state_folder in data_path.iterdir():
-                if state_folder.is_dir():
-                    state = state_folder.name
-                    
-                    for year_folder in state_folder.iterdir():
-                        if year_folder.is_dir():
-                            year = year_folder.name
-                            
-                            for json_file in year_folder.glob("*.json"):
-                                quarter = json_file.stem
-                                
-                                with open(json_file, 'r') as f:
-                                    data = json.load(f)
-                                    
-                                    if data['data']['usersByDevice']:
-                                        for device in data['data']['usersByDevice']:
-                                            data_list.append({
-                                                'State': state.replace('-', ' ').title(),
-                                                'Year': int(year),
-                                                'Quarter': int(quarter),
-                                                'Brands': device['brand'],
-                                                'Transaction_count': device['count'],
-                                                'Percentage': device['percentage']
-                                            })
-            
-            df = pd.DataFrame(data_list)
+            df = self.extract_datasets(['aggregated_user'])['aggregated_user']
             print(f"✅ Extracted {len(df)} user records")
             return df
             
@@ -251,15 +314,45 @@ class PhonePeDataSetup:
             print(f"❌ Error extracting user data: {e}")
             return pd.DataFrame()
     
-    def load_data_to_mysql(self, df, table_name):
-        """Load DataFrame to MySQL table"""
+    def extract_dataset(self, dataset):
+        """Extract any dataset listed in ingestion.DATASETS"""
+        print(f"\n📂 Processing {dataset} data...")
+        
         try:
-            engine = create_engine(
-                f"mysql+pymysql://{self.mysql_config['user']}:{quote_plus(self.mysql_config['password'])}@"
-                f"{self.mysql_config['host']}/{self.mysql_config['database']}"
-            )
+            df = self.extract_datasets([dataset])[dataset]
+            print(f"✅ Extracted {len(df)} {dataset} records")
+            return df
+            
+        except Exception as e:
+            print(f"❌ Error extracting {dataset} data: {e}")
+            return pd.DataFrame()
+    
+    def get_engine(self):
+        """Create a SQLAlchemy engine for the configured MySQL database"""
+        return create_engine(
+            f"mysql+pymysql://{self.mysql_config['user']}:{quote_plus(self.mysql_config['password'])}@"
+            f"{self.mysql_config['host']}/{self.mysql_config['database']}"
+        )
+    
+    def insert_rows(self, conn, table_name, columns, rows, chunk_size=50000):
+        """Insert row tuples in chunks; the driver batches them into multi-row INSERTs"""
+        placeholders = ', '.join(['%s'] * len(columns))
+        insert_sql = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        
+        for start in range(0, len(rows), chunk_size):
+            conn.exec_driver_sql(insert_sql, rows[start:start + chunk_size])
+    
+    def load_data_to_mysql(self, df, table_name, chunk_size=50000):
+        """Bulk load a DataFrame into an existing typed table, replacing its rows"""
+        try:
+            engine = self.get_engine()
+            
+            # Keeps the typed schema from create_tables instead of to_sql's drop-and-recreate
+            with span('load', table=table_name, rows=len(df)), engine.begin() as conn:
+                conn.exec_driver_sql(f"DELETE FROM {table_name}")
+                self.insert_rows(conn, table_name, list(df.columns),
+                                 df.astype(object).to_numpy().tolist(), chunk_size)
             
-            df.to_sql(table_name, engine, if_exists='replace', index=False)
             print(f"✅ Loaded {len(df)} records into {table_name}")
             return True
             
@@ -267,6 +360,135 @@ class PhonePeDataSetup:
             print(f"❌ Error loading data to {table_name}: {e}")
             return False
     
+    def load_batches_to_mysql(self, batches, datasets):
+        """Replace the given tables with streamed (dataset, rows) batches in one transaction"""
+        engine = self.get_engine()
+        counts = {dataset: 0 for dataset in datasets}
+        
+        with span('load', tables=','.join(datasets)) as record, engine.begin() as conn:
+            for dataset in datasets:
+                conn.exec_driver_sql(f"DELETE FROM {dataset}")
+            for dataset, rows in batches:
+                self.insert_rows(conn, dataset, KEY_COLUMNS + DATASETS[dataset]['columns'], rows)
+                counts[dataset] += len(rows)
+            record['rows'] = sum(counts.values())
+        
+        return counts
+    
+    def refresh_rollups(self, conn=None):
+        """Rebuild the rollup cube and top-N tables from the loaded base tables"""
+        if conn is None:
+            try:
+                with self.get_engine().begin() as conn:
+                    return self.refresh_rollups(conn)
+            except Exception as e:
+                print(f"❌ Error refreshing rollups: {e}")
+                return False
+        
+        with span('rollups'):
+            for statement in refresh_statements():
+                conn.exec_driver_sql(statement)
+        print("✅ Refreshed rollup cube and top-N rankings")
+        return True
+    
+    def load_manifest(self, engine):
+        """Read the source file manifest as {path: row}"""
+        with engine.connect() as conn:
+            result = conn.execute(text(f"SELECT {', '.join(MANIFEST_COLUMNS)} FROM {MANIFEST_TABLE}"))
+            return {row['Path']: dict(row) for row in result.mappings()}
+    
+    def write_manifest(self, conn, rows, removed_paths=()):
+        """Upsert manifest rows and drop entries for removed files"""
+        paths = [row['Path'] for row in rows] + list(removed_paths)
+        for start in range(0, len(paths), 1000):
+            conn.execute(text(f"DELETE FROM {MANIFEST_TABLE} WHERE Path IN :paths")
+                         .bindparams(bindparam('paths', expanding=True)),
+                         {'paths': paths[start:start + 1000]})
+        self.insert_rows(conn, MANIFEST_TABLE, MANIFEST_COLUMNS, [manifest_record(row) for row in rows])
+    
+    def record_manifest(self):
+        """Snapshot every source file into the manifest after a full load"""
+        print("\n🧾 Recording source file manifest...")
+        
+        try:
+            engine = self.get_engine()
+            changed, removed, touched = diff_manifest({}, self.data_source(), list(DATASETS))
+            with engine.begin() as conn:
+                conn.exec_driver_sql(f"DELETE FROM {MANIFEST_TABLE}")
+                self.write_manifest(conn, changed)
+            
+            print(f"✅ Recorded {len(changed)} source files")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error recording manifest: {e}")
+            return False
+    
+    @traced('setup.refresh')
+    def refresh_data(self, download=True):
+        """Parse only new or changed source files and replace just their (State, Year, Quarter) slices"""
+        print("="*60)
+        print("PhonePe Pulse Incremental Refresh")
+        print("="*60)
+        
+        if download and not self.download_phonepe_data():
+            return False
+        
+        if self.is_current(self.mysql_target()):
+            print("✅ Data is already up to date")
+            return True
+        
+        if not self.create_database() or not self.create_tables():
+            return False
+        
+        try:
+            engine = self.get_engine()
+            source = self.data_source()
+            
+            print("\n🔍 Comparing source files against the manifest...")
+            with span('refresh.diff') as record:
+                changed, removed, touched = diff_manifest(self.load_manifest(engine), source, list(DATASETS))
+                record['rows'] = len(changed) + len(removed) + len(touched)
+            print(f"✅ {len(changed)} new/changed, {len(removed)} removed, {len(touched)} touched-only files")
+            
+            # One file is exactly one (dataset, State, Year, Quarter) slice
+            tasks = [(row['Dataset'], row['State'], row['Year'], row['Quarter'], row['Path'])
+                     for row in changed]
+            with span('refresh.parse', files=len(tasks)) as record:
+                parsed = IngestionEngine(source, workers=self.workers).parse_tasks(tasks)
+                record['rows'] = sum(len(file_rows) for file_rows in parsed)
+            
+            with engine.begin() as conn:
+                for row in changed + removed:
+                    conn.execute(
+                        text(f"DELETE FROM {row['Dataset']} WHERE State = :State AND Year = :Year AND Quarter = :Quarter"),
+                        {key: row[key] for key in KEY_COLUMNS}
+                    )
+                
+                for dataset in DATASETS:
+                    rows = [file_row for task, file_rows in zip(tasks, parsed) if task[0] == dataset
+                            for file_row in file_rows]
+                    if rows:
+                        self.insert_rows(conn, dataset, KEY_COLUMNS + DATASETS[dataset]['columns'], rows)
+                        print(f"✅ Upserted {len(rows)} records into {dataset}")
+                
+                self.write_manifest(conn, changed + touched, [row['Path'] for row in removed])
+                
+                # Always: the target is not current, so even with unchanged sources its
+                # rollups may come from older definitions
+                self.refresh_rollups(conn)
+            
+            print("\n" + "="*60)
+            self.mark_current(self.mysql_target())
+            print("✅ Refresh Complete!")
+            print("="*60)
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error refreshing data: {e}")
+            return False
+    
+    @traced('setup.full')
     def run_full_setup(self):
         """Run complete setup process"""
         print("="*60)
@@ -277,6 +499,11 @@ class PhonePeDataSetup:
         if not self.download_phonepe_data():
             return False
         
+        # Same archive as the last successful load: nothing to do
+        if self.is_current(self.mysql_target()):
+            print("✅ Data is already up to date")
+            return True
+        
         # Step 2: Create database
         if not self.create_database():
             return False
@@ -285,15 +512,28 @@ class PhonePeDataSetup:
         if not self.create_tables():
             return False
         
-        # Step 4: Extract and load transaction data
-        df_transaction = self.extract_aggregated_transaction()
-        if not df_transaction.empty:
-            self.load_data_to_mysql(df_transaction, 'aggregated_transaction')
+        # Steps 4-5: Stream every dataset from the process pool into MySQL in fixed-size batches
+        try:
+            engine = IngestionEngine(self.data_source(), workers=self.workers)
+            print(f"\n⚙️ Streaming {len(DATASETS)} datasets with {engine.workers} worker(s)...")
+            counts = self.load_batches_to_mysql(engine.iter_batches(list(DATASETS)), list(DATASETS))
+        except Exception as e:
+            print(f"❌ Error loading data: {e}")
+            return False
+        
+        for table_name, count in counts.items():
+            print(f"✅ Loaded {count} records into {table_name}")
         
-        # Step 5: Extract and load user data
-        df_user = self.extract_aggregated_user()
-        if not df_user.empty:
-            self.load_data_to_mysql(df_user, 'aggregated_user')
+        # Step 6: Materialize the rollups the dashboard reads
+        if not self.refresh_rollups():
+            return False
+        
+        # Step 7: Record the manifest so later runs can refresh incrementally
+        if not self.record_manifest():
+            return False
+        
+        # Only a load that finished every step may short-circuit the next run
+        self.mark_current(self.mysql_target())
         
         print("\n" + "="*60)
         print("✅ Setup Complete!")
@@ -301,6 +541,69 @@ class PhonePeDataSetup:
         
         return True
 
+    
+    @traced('setup.sqlite')
+    def build_sqlite(self, db_path='phonepe_data.db', download=True, snapshot=True, check=None):
+        """Build the dashboard's SQLite database straight from the JSON, no MySQL needed
+        
+        Also writes a versioned Arrow snapshot next to the database for fast dashboard reads.
+        check(build_path, counts) may veto the new file by raising before it replaces db_path.
+        """
+        print("="*60)
+        print("PhonePe Pulse SQLite Build")
+        print("="*60)
+        
+        if download and not self.download_phonepe_data():
+            return False
+        
+        target = f"sqlite:{Path(db_path).resolve()}"
+        # The file itself must be current too: an older database may have been copied over it
+        if (Path(db_path).exists() and self.is_current(target)
+                and file_schema_version(db_path) == SCHEMA_VERSION):
+            print(f"✅ {db_path} is already up to date")
+            return True
+        
+        writer = None
+        try:
+            engine = IngestionEngine(self.data_source(), workers=self.workers)
+            version = new_version()
+            writer = SnapshotWriter(Path(db_path).parent / "snapshots", version) if snapshot else None
+            
+            def batches():
+                # Each batch goes to the snapshot and the database as it is parsed
+                for dataset, rows in engine.iter_batches(list(DATASETS)):
+                    if writer:
+                        writer.write(dataset, to_frame(dataset, rows))
+                    yield dataset, rows
+            
+            def publish(build_path, counts):
+                # Runs after the new file has passed validation and before build_database
+                # swaps it in, so a database never names a snapshot version that is not
+                # on disk and a rejected build never publishes its snapshot
+                if check:
+                    check(build_path, counts)
+                if writer:
+                    with span('snapshot', version=version):
+                        writer.commit()
+            
+            print(f"\n⚙️ Streaming {len(DATASETS)} datasets with {engine.workers} worker(s) into {db_path}...")
+            if writer:
+                print(f"🧊 Writing Arrow snapshot {version} to {writer.snapshot_root}")
+            counts = build_database(db_path, batches(), version, check=publish)
+            for table_name, count in counts.items():
+                print(f"✅ Loaded {count} records into {table_name}")
+            
+            print("\n" + "="*60)
+            self.mark_current(target)
+            print("✅ SQLite Build Complete!")
+            print("="*60)
+            return True
+            
+        except Exception as e:
+            if writer:
+                writer.discard()
+            print(f"❌ Error building SQLite database: {e}")
+            return False
 
 if __name__ == "__main__":
     # MySQL Configuration
@@ -311,6 +614,24 @@ if __name__ == "__main__":
         'database': 'phonepe_pulse'
     }
     
-    # Run setup
-    setup = PhonePeDataSetup(mysql_config)
-    setup.run_full_setup()
\ No newline at end of file
+    # Run setup (PHONEPE_WORKERS=1 forces the serial parser)
+    workers = int(os.environ['PHONEPE_WORKERS']) if os.environ.get('PHONEPE_WORKERS') else None
+    # PHONEPE_PERF_LOG=<file> writes per-stage timings as JSON lines;
+    # PHONEPE_METRICS_PORT=<port> serves them on http://127.0.0.1:<port>/metrics while running
+    if os.environ.get('PHONEPE_METRICS_PORT'):
+        start_metrics_server(os.environ['PHONEPE_METRICS_PORT'])
+    
+    # PHONEPE_ARCHIVE=Data/phonepe_data.zip streams JSON out of the zip instead of extracting it;
+    # PHONEPE_SOURCE_URL / PHONEPE_CACHE_DIR point the downloader at a mirror and a cache directory
+    setup = PhonePeDataSetup(mysql_config, workers=workers, archive_path=os.environ.get('PHONEPE_ARCHIVE'),
+                             source_url=os.environ.get('PHONEPE_SOURCE_URL'),
+                             cache_dir=os.environ.get('PHONEPE_CACHE_DIR'))
+    
+    # `python src/setup_database.py --refresh` only ingests new or changed files
+    # `python src/setup_database.py --sqlite` builds phonepe_data.db without MySQL
+    if '--refresh' in sys.argv:
+        setup.refresh_data()
+    elif '--sqlite' in sys.argv:
+        setup.build_sqlite(download='--no-download' not in sys.argv)
+    else:
+        setup.run_full_setup()
\ No newline at end of file
@@ -0,0 +1,70 @@
+import os
+import shutil
+import pyarrow as pa
+from pathlib import Path
+
+# Snapshot layout (one directory per build, CURRENT names the live one):
+#   snapshots/CURRENT
+#   snapshots/<version>/<table>/Year=<year>/Quarter=<quarter>/part-<n>.arrow
+# Partition files are uncompressed Arrow IPC so readers can memory-map them; Year and
+# Quarter live only in the path. A streamed build adds one part per batch that touches
+# a partition, and readers concatenate the parts in order.
+CURRENT_FILE = 'CURRENT'
+PART_FILE = 'part-{:05d}.arrow'
+KEEP_VERSIONS = 2
+
+
+class SnapshotWriter:
+    """Write a snapshot version batch by batch, then publish it with commit()"""
+
+    def __init__(self, snapshot_root, version):
+        self.snapshot_root = Path(snapshot_root)
+        self.version = version
+        self.staging = self.snapshot_root / f".{version}.tmp"
+        if self.staging.exists():
+            shutil.rmtree(self.staging)
+        self.staging.mkdir(parents=True)
+        self.parts = {}
+
+    def write(self, table, df):
+        """Append one DataFrame batch, split into its (Year, Quarter) partitions"""
+        for (year, quarter), part in df.groupby(['Year', 'Quarter'], sort=True):
+            part_dir = self.staging / table / f"Year={year}" / f"Quarter={quarter}"
+            part_dir.mkdir(parents=True, exist_ok=True)
+            number = self.parts.get(part_dir, 0)
+            self.parts[part_dir] = number + 1
+            arrow_table = pa.Table.from_pandas(part.drop(columns=['Year', 'Quarter']), preserve_index=False)
+            with pa.OSFile(str(part_dir / PART_FILE.format(number)), 'wb') as sink:
+                with pa.ipc.new_file(sink, arrow_table.schema) as writer:
+                    writer.write_table(arrow_table)
+
+    def commit(self):
+        """Move the staged version into place and make it CURRENT"""
+        self.staging.rename(self.snapshot_root / self.version)
+
+        # Readers open CURRENT and then the version it names, so swap it atomically
+        current_tmp = self.snapshot_root / f".{CURRENT_FILE}.tmp"
+        current_tmp.write_text(self.version)
+        os.replace(current_tmp, self.snapshot_root / CURRENT_FILE)
+
+        prune_snapshots(self.snapshot_root)
+        return self.snapshot_root / self.version
+
+    def discard(self):
+        """Drop a staged version that will not be committed"""
+        shutil.rmtree(self.staging, ignore_errors=True)
+
+
+def write_snapshot(snapshot_root, version, frames):
+    """Write {table: DataFrame} as a new snapshot version and make it CURRENT"""
+    writer = SnapshotWriter(snapshot_root, version)
+    for table, df in frames.items():
+        writer.write(table, df)
+    return writer.commit()
+
+
+def prune_snapshots(snapshot_root, keep=KEEP_VERSIONS):
+    """Delete all but the newest `keep` versions; older readers may still hold the previous one"""
+    versions = sorted(p for p in Path(snapshot_root).iterdir() if p.is_dir() and not p.name.startswith('.'))
+    for old in versions[:-keep]:
+        shutil.rmtree(old, ignore_errors=True)
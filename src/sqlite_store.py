@@ -0,0 +1,429 @@
+import os
+import time
+import fcntl
+import hashlib
+import sqlite3
+from pathlib import Path
+from contextlib import contextmanager
+from ingestion import DATASETS, KEY_COLUMNS, KEY_DTYPES
+from dimensions import (DIMENSIONS, DimensionKeys, create_dimension_sql, create_view_sql, dataset_dimensions,
+                        fact_table, key_column, keys_out_of_order, order_keys)
+from rollups import CREATE_SQL, refresh_statements
+from perf import span
+
+SQL_TYPES = {'int64': 'INTEGER', 'float64': 'REAL'}
+# Bumped whenever the table or index layout changes; stored in PRAGMA user_version.
+#   0 - untyped to_sql tables from the MySQL migration (no keys, no indexes)
+#   1 - typed WITHOUT ROWID tables keyed like MySQL, plus covering period indexes
+#   2 - rollup_cube / rollup_topn materialized from the aggregated tables
+#   3 - rollup_series: per-member quarterly series with growth and rank changes
+#   4 - integer-keyed fact tables + dimension tables, datasets served as views
+#   5 - rollup_series rolling average framed on the quarter, not the row
+#   6 - dimension keys numbered in name order, a period index per sortable column
+#   7 - rollup_series growth compared against the exact previous / year-ago quarter
+SCHEMA_VERSION = 7
+
+# Bulk-build settings. The database is written to a side file and renamed into
+# place once complete, so the build itself does not need a journal or fsyncs.
+BUILD_PRAGMAS = {
+    'journal_mode': 'OFF',
+    'synchronous': 'OFF',
+    'cache_size': -262144,  # negative = KiB, i.e. a 256 MB page cache
+    'temp_store': 'MEMORY',
+    'locking_mode': 'EXCLUSIVE',
+}
+
+
+class BuildValidationError(ValueError):
+    """A freshly built database failed its checks and was not swapped into place"""
+
+
+def table_columns(dataset):
+    """[(column, SQLite type)] for a dataset table"""
+    dtypes = {**KEY_DTYPES, **DATASETS[dataset]['dtypes']}
+    return [
+        (column, SQL_TYPES.get(dtypes.get(column), 'TEXT'))
+        for column in KEY_COLUMNS + DATASETS[dataset]['columns']
+    ]
+
+
+def fact_columns(dataset):
+    """[(column, SQLite type)] for a dataset's fact table: dimension names become keys"""
+    return [(key_column(column), 'INTEGER' if column in DIMENSIONS else sql_type)
+            for column, sql_type in table_columns(dataset)]
+
+
+def create_table_sql(dataset, table_name=None):
+    """CREATE TABLE statement with typed named columns and the same key as the MySQL schema"""
+    columns = ',\n    '.join(f"{column} {sql_type}" for column, sql_type in table_columns(dataset))
+    key = ', '.join(KEY_COLUMNS + DATASETS[dataset]['columns'][:1])
+    return (f"CREATE TABLE IF NOT EXISTS {table_name or dataset} (\n    {columns},\n"
+            f"    PRIMARY KEY ({key})\n) WITHOUT ROWID")
+
+
+def create_fact_sql(dataset):
+    """CREATE TABLE statement for a dataset's fact table, keyed like the named table"""
+    columns = ',\n    '.join(f"{column} {sql_type}" for column, sql_type in fact_columns(dataset))
+    key = ', '.join(key_column(column) for column in KEY_COLUMNS + DATASETS[dataset]['columns'][:1])
+    return (f"CREATE TABLE IF NOT EXISTS {fact_table(dataset)} (\n    {columns},\n"
+            f"    PRIMARY KEY ({key})\n) WITHOUT ROWID")
+
+
+def create_schema(conn, datasets=DATASETS):
+    """Dimension tables, fact tables and the views that present them as the datasets"""
+    for column in DIMENSIONS:
+        conn.execute(create_dimension_sql(column))
+    for dataset in datasets:
+        conn.execute(create_fact_sql(dataset))
+        conn.execute(create_view_sql(dataset))
+
+
+def create_index_sql(dataset):
+    """Covering indexes for the dashboard's period filters and sorted pages
+
+    Every query filters on (Year, Quarter) and groups by State or by the dataset's
+    dimension (Transaction_type, Brands, District, Pincode, ...), or pages through the
+    period sorted by one column. There is one index per such column, leading with the
+    period and the column and followed by the rest of the key, so a group or a page is
+    a range of it in order. Carrying the measure columns in the index lets SQLite answer
+    from the index alone; the indexes hold the integer keys, not the names.
+    """
+    dimension, measures = DATASETS[dataset]['columns'][0], DATASETS[dataset]['columns'][1:]
+    state, member = key_column('State'), key_column(dimension)
+    orders = {'period_state': [state, member], 'period_dim': [member, state]}
+    orders.update({f"period_{measure.lower()}": [measure, state, member] for measure in measures})
+    statements = []
+    for name, columns in orders.items():
+        indexed = ', '.join(['Year', 'Quarter'] + columns + [measure for measure in measures if measure not in columns])
+        statements.append(f"CREATE INDEX IF NOT EXISTS idx_{dataset}_{name} "
+                          f"ON {fact_table(dataset)} ({indexed})")
+    return statements
+
+
+def insert_sql(dataset):
+    """Parameterized INSERT for a dataset's fact table (rows encoded by DimensionKeys)"""
+    columns = [column for column, _ in fact_columns(dataset)]
+    return (f"INSERT INTO {fact_table(dataset)} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})")
+
+
+def connect_for_build(db_path):
+    """Open a connection tuned for one-shot bulk loading"""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    for pragma, value in BUILD_PRAGMAS.items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    return conn
+
+
+def write_rows(conn, dataset, rows, keys, chunk_size=100000):
+    """Encode named row tuples with keys and insert them, and any new members, in one transaction"""
+    sql = insert_sql(dataset)
+    conn.execute("BEGIN")
+    for start in range(0, len(rows), chunk_size):
+        conn.executemany(sql, keys.encode(dataset, rows[start:start + chunk_size]))
+    keys.flush(conn)
+    conn.execute("COMMIT")
+
+
+def create_indexes(conn, datasets=None):
+    """Create the covering indexes"""
+    for dataset in datasets or DATASETS:
+        for statement in create_index_sql(dataset):
+            conn.execute(statement)
+
+
+def drop_indexes(conn):
+    """Drop the covering indexes, whatever layout they were created with"""
+    for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'").fetchall():
+        conn.execute(f"DROP INDEX {name}")
+
+
+def refresh_rollups(conn):
+    """Create the rollup tables if needed and rebuild them from the fact tables"""
+    for statement in CREATE_SQL + refresh_statements(keyed=True):
+        conn.execute(statement)
+
+
+def finish_schema(conn):
+    """Key order, indexes, rollups and version stamp for a freshly loaded database"""
+    order_keys(conn)
+    create_indexes(conn)
+    refresh_rollups(conn)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def schema_version(conn):
+    """Schema version stamped on a database (0 for pre-versioning files)"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def file_schema_version(db_path):
+    """Schema version of the database file at db_path, without writing to it"""
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        return schema_version(conn)
+    finally:
+        conn.close()
+
+
+def existing_tables(conn):
+    """Names of the tables present in a database"""
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def migrate_database(db_path):
+    """Upgrade an existing database in place to SCHEMA_VERSION
+
+    Version 0 tables (TEXT columns, no keys) are copied into typed keyed tables with
+    explicit casts; rows with a missing key are dropped and duplicate keys collapse.
+    Named tables then move into integer-keyed fact tables behind views of the same name,
+    dimension keys are renumbered in name order, the indexes are recreated and the
+    rollups are rebuilt with the current definitions.
+    Returns the version the database had before migrating.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        version = schema_version(conn)
+        if version >= SCHEMA_VERSION:
+            return version
+
+        conn.execute("BEGIN IMMEDIATE")
+        if version < 1:
+            retype_tables(conn)
+        if version < 4:
+            key_dimensions(conn)
+        if version < 7:
+            refresh_rollups(conn)
+        if version < 6:
+            order_keys(conn)
+            drop_indexes(conn)
+            create_indexes(conn)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+
+        conn.execute("ANALYZE")
+        conn.execute("VACUUM")
+        return version
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def retype_tables(conn):
+    """Version 0 -> 1: rebuild every dataset table with typed columns and keys"""
+    tables = existing_tables(conn)
+    for dataset in DATASETS:
+        if dataset not in tables:
+            conn.execute(create_table_sql(dataset))
+            continue
+
+        columns = table_columns(dataset)
+        key_columns = KEY_COLUMNS + DATASETS[dataset]['columns'][:1]
+        casts = ', '.join(f"CAST({column} AS {sql_type})" for column, sql_type in columns)
+        not_null = ' AND '.join(f"{column} IS NOT NULL" for column in key_columns)
+
+        conn.execute(create_table_sql(dataset, f"{dataset}_migrating"))
+        conn.execute(f"INSERT OR REPLACE INTO {dataset}_migrating "
+                     f"SELECT {casts} FROM {dataset} WHERE {not_null}")
+        conn.execute(f"DROP TABLE {dataset}")
+        conn.execute(f"ALTER TABLE {dataset}_migrating RENAME TO {dataset}")
+
+
+def key_dimensions(conn):
+    """Version 3 -> 4: split every named dataset table into dimension and fact tables"""
+    tables = existing_tables(conn)
+    for column in DIMENSIONS:
+        conn.execute(create_dimension_sql(column))
+    for dataset in DATASETS:
+        conn.execute(create_fact_sql(dataset))
+        if dataset in tables:
+            dimensions = {column: DIMENSIONS[column] for _, column in dataset_dimensions(dataset)}
+            for column, dimension in dimensions.items():
+                conn.execute(f"INSERT OR IGNORE INTO {dimension} (Name) "
+                             f"SELECT DISTINCT {column} FROM {dataset} ORDER BY {column}")
+            values = ', '.join(f"{DIMENSIONS[column]}.Id" if column in dimensions else f"{dataset}.{column}"
+                               for column, _ in table_columns(dataset))
+            joins = ' '.join(f"JOIN {dimension} ON {dimension}.Name = {dataset}.{column}"
+                             for column, dimension in dimensions.items())
+            conn.execute(f"INSERT INTO {fact_table(dataset)} SELECT {values} FROM {dataset} {joins}")
+            conn.execute(f"DROP TABLE {dataset}")
+        conn.execute(create_view_sql(dataset))
+
+
+def new_version():
+    """Version label for a build: a sortable UTC timestamp"""
+    return time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())
+
+
+def stamp_version(conn, version=None, table_versions=None):
+    """Record which ingestion run produced this database, and each table's content version
+
+    Table versions are stored as 'version:<table>'; readers key cached results on them so
+    a rebuild only invalidates results for tables whose contents actually changed.
+    """
+    conn.execute("CREATE TABLE IF NOT EXISTS build_info (Key TEXT PRIMARY KEY, Value TEXT)")
+    values = [(f"version:{table}", table_version) for table, table_version in (table_versions or {}).items()]
+    if version:
+        values.append(('version', version))
+    conn.executemany("INSERT OR REPLACE INTO build_info (Key, Value) VALUES (?, ?)", values)
+
+
+class ContentDigest:
+    """Order-independent digest of a table's rows: the sum of a 128-bit hash per row
+
+    Batches can be fed in load order and the finished table read back in key order
+    and both give the same value, so the digest stamped while loading can be checked
+    against what the file actually holds.
+    """
+
+    def __init__(self, dataset):
+        # Integer JSON values bound to a REAL column read back as floats
+        self.real = [position for position, (_, sql_type) in enumerate(table_columns(dataset))
+                     if sql_type == 'REAL']
+        self.total = 0
+
+    def update(self, rows):
+        real, blake2b, total = self.real, hashlib.blake2b, 0
+        for row in rows:
+            if any(type(row[position]) is int for position in real):
+                row = list(row)
+                for position in real:
+                    if type(row[position]) is int:
+                        row[position] = float(row[position])
+                row = tuple(row)
+            total += int.from_bytes(blake2b(repr(row).encode(), digest_size=16).digest(), 'big')
+        self.total += total
+
+    def hexdigest(self):
+        return f"{self.total % 2**128:032x}"
+
+
+def content_digests(datasets=DATASETS):
+    """ContentDigest per table; feed each batch of named row tuples with update(rows)"""
+    return {dataset: ContentDigest(dataset) for dataset in datasets}
+
+
+@contextmanager
+def build_lock(db_path):
+    """Exclusive lock on db_path's side file for the duration of one build
+
+    Builders share the '<db>.building' path, so a second concurrent build fails fast
+    instead of deleting the first one's half-written file.
+    """
+    with open(f"{db_path}.lock", 'w') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise RuntimeError(f"another build of {db_path} is in progress") from None
+        yield
+
+
+def verify_build(db_path, counts, table_versions):
+    """Check a built file against what was streamed into it before it goes live
+
+    Raises BuildValidationError unless SQLite's quick_check passes, the schema is
+    current, dimension keys follow name order and every key resolves to a member, and
+    reading every table back
+    yields exactly the rows that were loaded: the same count and the same content
+    digest, which must also be the one stamped in build_info.
+    """
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        problems = [row[0] for row in conn.execute("PRAGMA quick_check") if row[0] != 'ok']
+        if schema_version(conn) != SCHEMA_VERSION:
+            problems.append(f"schema version {schema_version(conn)}, expected {SCHEMA_VERSION}")
+        stamped = dict(conn.execute("SELECT Key, Value FROM build_info"))
+        for column in DIMENSIONS:
+            if keys_out_of_order(conn, column):
+                problems.append(f"{DIMENSIONS[column]}: keys are not in name order")
+        for dataset in DATASETS:
+            for _, column in dataset_dimensions(dataset):
+                dangling = conn.execute(
+                    f"SELECT COUNT(*) FROM {fact_table(dataset)} WHERE {key_column(column)} NOT IN "
+                    f"(SELECT Id FROM {DIMENSIONS[column]})").fetchone()[0]
+                if dangling:
+                    problems.append(f"{dataset}: {dangling} rows with an unknown {column} key")
+
+            # Read the rows back through the view, so names are decoded as readers see them
+            found, digest = 0, ContentDigest(dataset)
+            result = conn.execute(f"SELECT * FROM {dataset}")
+            for rows in iter(lambda: result.fetchmany(100000), []):
+                digest.update(rows)
+                found += len(rows)
+            if found != counts.get(dataset, 0):
+                problems.append(f"{dataset}: {found} rows, loaded {counts.get(dataset, 0)}")
+            elif digest.hexdigest()[:16] != table_versions[dataset]:
+                problems.append(f"{dataset}: stored rows do not match the loaded rows")
+            if stamped.get(f"version:{dataset}") != table_versions[dataset]:
+                problems.append(f"{dataset}: build_info does not carry the loaded content digest")
+    finally:
+        conn.close()
+    if problems:
+        raise BuildValidationError(f"{db_path} failed validation: {'; '.join(problems)}")
+
+
+def build_database(db_path, batches, version=None, check=None):
+    """Write (dataset, rows) batches into a fresh SQLite file and atomically move it to db_path
+
+    batches may be a {dataset: rows} dict or any iterable of (dataset, rows) pairs,
+    such as IngestionEngine.iter_batches(); each batch is written as it arrives.
+    The file only replaces db_path once every batch is written and verify_build() and
+    check(build_path, counts), if given, have passed; otherwise it is deleted and
+    readers keep the old database. Either way they never see a partial one.
+    """
+    if isinstance(batches, dict):
+        batches = batches.items()
+    db_path = Path(db_path)
+    build_path = db_path.with_name(db_path.name + '.building')
+
+    with build_lock(db_path):
+        if build_path.exists():
+            build_path.unlink()
+
+        counts = {}
+        digests = content_digests()
+        keys = DimensionKeys()
+        try:
+            conn = connect_for_build(build_path)
+            try:
+                create_schema(conn)
+                with span('load') as record:
+                    for dataset, rows in batches:
+                        write_rows(conn, dataset, rows, keys)
+                        counts[dataset] = counts.get(dataset, 0) + len(rows)
+                        digests[dataset].update(rows)
+                    record['rows'] = sum(counts.values())
+                # Indexes are cheaper to build once after the bulk load than to maintain during it
+                with span('indexes_and_rollups'):
+                    finish_schema(conn)
+                table_versions = {dataset: digest.hexdigest()[:16] for dataset, digest in digests.items()}
+                stamp_version(conn, version, table_versions)
+                conn.execute("ANALYZE")
+            finally:
+                conn.close()
+
+            with span('validate'):
+                verify_build(build_path, counts, table_versions)
+                if check:
+                    check(build_path, counts)
+        except BaseException:
+            # A failed batch, validation or veto never leaves a half-built side file behind
+            build_path.unlink(missing_ok=True)
+            raise
+
+        os.replace(build_path, db_path)
+    return counts
+
+
+if __name__ == "__main__":
+    # python src/sqlite_store.py [phonepe_data.db] upgrades an existing database in place
+    import sys
+    db_path = sys.argv[1] if len(sys.argv) > 1 else 'phonepe_data.db'
+    previous = migrate_database(db_path)
+    if previous >= SCHEMA_VERSION:
+        print(f"✅ {db_path} is already at schema version {previous}")
+    else:
+        print(f"✅ Migrated {db_path} from schema version {previous} to {SCHEMA_VERSION}")
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Same import roots as app.py and the benchmarks: the repo for `dashboard`, src/ for the pipeline
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src'))
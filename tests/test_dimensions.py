@@ -0,0 +1,55 @@
+import sqlite3
+import pytest
+from dimensions import DIMENSIONS, DimensionKeys, create_dimension_sql
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    for column in DIMENSIONS:
+        conn.execute(create_dimension_sql(column))
+    yield conn
+    conn.close()
+
+
+def members(conn, table):
+    return conn.execute(f"SELECT Id, Name FROM {table} ORDER BY Id").fetchall()
+
+
+def test_names_keep_their_keys_across_batches_and_datasets(conn):
+    keys = DimensionKeys(conn)
+
+    first = keys.encode('aggregated_transaction', [('Goa', 2021, 1, 'Recharge', 1, 1.0),
+                                                  ('Delhi', 2021, 1, 'Recharge', 2, 2.0)])
+    second = keys.encode('map_transaction', [('Delhi', 2021, 2, 'North Goa', 3, 3.0),
+                                             ('Kerala', 2021, 2, 'South Goa', 4, 4.0)])
+
+    assert first == [(1, 2021, 1, 1, 1, 1.0), (2, 2021, 1, 1, 2, 2.0)]
+    assert second == [(2, 2021, 2, 1, 3, 3.0), (3, 2021, 2, 2, 4, 4.0)]
+
+
+def test_flush_inserts_only_members_added_since_the_last_flush(conn):
+    keys = DimensionKeys(conn)
+    keys.encode('aggregated_user', [('Goa', 2021, 1, 'Xiaomi', 10, 0.5)])
+    keys.flush(conn)
+    keys.encode('aggregated_user', [('Goa', 2021, 2, 'Xiaomi', 11, 0.5), ('Goa', 2021, 2, 'Apple', 12, 0.5)])
+
+    keys.flush(conn)
+
+    assert members(conn, 'dim_state') == [(1, 'Goa')]
+    assert members(conn, 'dim_brand') == [(1, 'Xiaomi'), (2, 'Apple')]
+    assert all(not pending for pending in keys.pending.values())
+
+
+def test_a_later_run_continues_from_the_stored_keys(conn):
+    earlier = DimensionKeys(conn)
+    earlier.encode('aggregated_transaction', [('Goa', 2021, 1, 'Recharge', 1, 1.0),
+                                              ('Delhi', 2021, 1, 'Recharge', 2, 2.0)])
+    earlier.flush(conn)
+
+    later = DimensionKeys(conn)
+    rows = later.encode('aggregated_transaction', [('Delhi', 2022, 1, 'Others', 3, 3.0),
+                                                   ('Assam', 2022, 1, 'Recharge', 4, 4.0)])
+
+    assert rows == [(2, 2022, 1, 2, 3, 3.0), (3, 2022, 1, 1, 4, 4.0)]
+    assert later.pending['State'] == [(3, 'Assam')]
@@ -0,0 +1,131 @@
+import hashlib
+import threading
+import pytest
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from downloader import CHUNK_SIZE, PART_FILE, ArchiveCache
+
+
+class Upstream:
+    """What the stand-in server serves, and every request it received"""
+
+    def __init__(self, body, etag):
+        self.body = body
+        self.etag = etag
+        self.cut_after = None  # drop the connection after this many bytes, once
+        self.requests = []
+
+
+def make_handler(upstream):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            upstream.requests.append(dict(self.headers))
+            if self.headers.get('If-None-Match') == upstream.etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+
+            start, status = 0, 200
+            if self.headers.get('Range') and self.headers.get('If-Range') == upstream.etag:
+                start = int(self.headers['Range'][len('bytes='):-1])
+                if start >= len(upstream.body):
+                    self.send_response(416)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                status = 206
+
+            payload = upstream.body[start:]
+            self.send_response(status)
+            self.send_header('ETag', upstream.etag)
+            self.send_header('Content-Length', str(len(payload)))
+            if status == 206:
+                self.send_header('Content-Range', f"bytes {start}-{len(upstream.body) - 1}/{len(upstream.body)}")
+            self.end_headers()
+            if upstream.cut_after is not None:
+                payload, upstream.cut_after = payload[:upstream.cut_after], None
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def upstream():
+    # Several download chunks, so an interrupted transfer keeps the chunks it completed
+    upstream = Upstream(bytes(range(256)) * (3 * CHUNK_SIZE // 256), '"v1"')
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(upstream))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    upstream.url = f"http://127.0.0.1:{server.server_address[1]}/master.zip"
+    yield upstream
+    server.shutdown()
+    server.server_close()
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def interrupted_download(cache, upstream):
+    """Drop the connection halfway through a transfer; returns the bytes kept in the cache"""
+    upstream.cut_after = len(upstream.body) // 2
+    with pytest.raises(requests.RequestException):
+        cache.fetch(upstream.url, attempts=1, timeout=5)
+    kept = (cache.cache_dir / PART_FILE).stat().st_size
+    assert 0 < kept < len(upstream.body)
+    return kept
+
+
+def test_unchanged_upstream_is_revalidated_with_a_304(tmp_path, upstream):
+    cache = ArchiveCache(tmp_path)
+    path, digest, changed = cache.fetch(upstream.url, timeout=5)
+    assert (digest, changed) == (sha256(upstream.body), True)
+    assert path.read_bytes() == upstream.body
+
+    again = cache.fetch(upstream.url, timeout=5)
+
+    assert again == (path, digest, False)
+    assert upstream.requests[-1]['If-None-Match'] == upstream.etag
+    assert not (tmp_path / PART_FILE).exists()
+
+
+def test_interrupted_transfer_resumes_with_a_range_request(tmp_path, upstream):
+    cache = ArchiveCache(tmp_path)
+    kept = interrupted_download(cache, upstream)
+
+    path, digest, changed = cache.fetch(upstream.url, timeout=5)
+
+    assert upstream.requests[-1]['Range'] == f"bytes={kept}-"
+    assert upstream.requests[-1]['If-Range'] == upstream.etag
+    assert (digest, changed) == (sha256(upstream.body), True)
+    assert path.read_bytes() == upstream.body
+    assert not (tmp_path / PART_FILE).exists()
+
+
+def test_partial_of_an_older_archive_is_not_spliced_onto_a_new_one(tmp_path, upstream):
+    cache = ArchiveCache(tmp_path)
+    interrupted_download(cache, upstream)
+    upstream.body, upstream.etag = bytes(reversed(upstream.body)), '"v2"'
+
+    path, digest, _ = cache.fetch(upstream.url, timeout=5)
+
+    # If-Range no longer matches, so the server sent the whole new archive
+    assert upstream.requests[-1]['If-Range'] == '"v1"'
+    assert digest == sha256(upstream.body)
+    assert path.read_bytes() == upstream.body
+
+
+def test_unsatisfiable_range_restarts_the_download(tmp_path, upstream):
+    cache = ArchiveCache(tmp_path)
+    kept = interrupted_download(cache, upstream)
+    with open(tmp_path / PART_FILE, 'ab') as f:
+        f.write(b'\0' * len(upstream.body))
+
+    path, digest, _ = cache.fetch(upstream.url, attempts=2, timeout=5)
+
+    ranges = [request.get('Range') for request in upstream.requests[1:]]
+    assert ranges == [f"bytes={kept + len(upstream.body)}-", None]
+    assert digest == sha256(upstream.body)
+    assert path.read_bytes() == upstream.body
@@ -0,0 +1,46 @@
+import pandas as pd
+from dashboard.frames import compact, compact_result, footprint, memory_report, share
+
+
+def frame():
+    return pd.DataFrame({
+        'State': ['Goa', 'Delhi', 'Goa', 'Delhi'] * 50,
+        'Year': [2021] * 200,
+        'Quarter': [1, 2, 3, 4] * 50,
+        'Transaction_amount': [1.5e11, 2.25, 3.0, 4.0] * 50,
+    })
+
+
+def test_compact_encodes_text_and_downcasts_integers_only():
+    df = compact(frame())
+
+    assert isinstance(df['State'].dtype, pd.CategoricalDtype)
+    assert df['Year'].dtype == 'int16' and df['Quarter'].dtype == 'int8'
+    assert df['Transaction_amount'].dtype == 'float64'
+    assert df.astype({'State': str, 'Year': 'int64', 'Quarter': 'int64'}).equals(frame())
+    assert footprint(df) < footprint(frame())
+
+
+def test_compact_result_reaches_frames_inside_tuples():
+    df, has_more = compact_result((frame(), True))
+
+    assert isinstance(df['State'].dtype, pd.CategoricalDtype) and has_more is True
+
+
+def test_shared_frames_are_not_changed_by_their_callers():
+    cached = compact(frame())
+    handed_out, flag = share((cached, False))
+
+    handed_out.loc[0, 'Transaction_amount'] = -1.0
+    handed_out['Extra'] = 1
+
+    assert cached.loc[0, 'Transaction_amount'] == 1.5e11
+    assert 'Extra' not in cached and flag is False
+
+
+def test_memory_report_has_one_row_per_table():
+    report = memory_report({'a': frame(), 'b': frame().head(0)})
+
+    assert report['Table'].tolist() == ['a', 'b']
+    assert report.loc[0, 'After_bytes'] < report.loc[0, 'Before_bytes']
+    assert report.loc[0, 'Saved_pct'] > 0
@@ -0,0 +1,33 @@
+import json
+import pytest
+from ingestion import SchemaError, parse_file
+
+
+class Source:
+    """Stand-in for DirectorySource serving one in-memory document"""
+
+    def __init__(self, document):
+        self.document = document
+
+    def read(self, path):
+        return json.dumps(self.document).encode()
+
+
+def parse(dataset, data):
+    return parse_file((dataset, 'Goa', 2021, 1, 'goa/2021/1.json'), Source({'success': True, 'data': data}))
+
+
+def test_first_payment_instrument_is_the_row():
+    data = {'transactionData': [{'name': 'Recharge', 'paymentInstruments': [
+        {'type': 'TOTAL', 'count': 3, 'amount': 4.5}, {'type': 'OTHER', 'count': 9, 'amount': 9.0}]}]}
+
+    assert parse('aggregated_transaction', data) == [('Goa', 2021, 1, 'Recharge', 3, 4.5)]
+
+
+@pytest.mark.parametrize('dataset, data', [
+    ('aggregated_transaction', {'transactionData': [{'name': 'Recharge', 'paymentInstruments': []}]}),
+    ('map_transaction', {'hoverDataList': [{'name': 'north goa district', 'metric': []}]}),
+])
+def test_record_without_metrics_is_a_schema_error(dataset, data):
+    with pytest.raises(SchemaError, match='malformed'):
+        parse(dataset, data)
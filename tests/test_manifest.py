@@ -0,0 +1,81 @@
+import os
+import json
+import pytest
+import manifest
+from ingestion import DATASETS, DirectorySource
+from manifest import diff_manifest
+
+DATASET = 'aggregated_transaction'
+
+
+def write(root, state, year, quarter, document, mtime=None):
+    """Write one source file and return its manifest path"""
+    path = root / DATASETS[DATASET]['path'] / state / str(year) / f"{quarter}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path.relative_to(root).as_posix()
+
+
+def document(count):
+    return {'data': {'transactionData': [
+        {'name': 'Recharge', 'paymentInstruments': [{'type': 'TOTAL', 'count': count, 'amount': 1.5}]}
+    ]}}
+
+
+@pytest.fixture
+def tree(tmp_path):
+    paths = {
+        'kept': write(tmp_path, 'goa', 2020, 1, document(1), mtime=1_600_000_000),
+        'changed': write(tmp_path, 'goa', 2020, 2, document(2), mtime=1_600_000_000),
+        'touched': write(tmp_path, 'goa', 2020, 3, document(3), mtime=1_600_000_000),
+        'removed': write(tmp_path, 'delhi', 2020, 1, document(4), mtime=1_600_000_000),
+    }
+    changed, removed, touched = diff_manifest({}, DirectorySource(tmp_path), [DATASET])
+    assert (removed, touched) == ([], [])
+    return tmp_path, paths, {row['Path']: row for row in changed}
+
+
+def test_first_scan_reports_every_file_as_changed(tree):
+    _, paths, previous = tree
+    assert set(previous) == set(paths.values())
+    row = previous[paths['kept']]
+    assert (row['Dataset'], row['State'], row['Year'], row['Quarter']) == (DATASET, 'Goa', 2020, 1)
+    assert all(row['Sha1'] for row in previous.values())
+
+
+def test_diff_classifies_changed_removed_touched_and_new_files(tree):
+    root, paths, previous = tree
+    # Same size, different content, so only the hash can tell
+    write(root, 'goa', 2020, 2, document(9), mtime=1_700_000_000)
+    write(root, 'goa', 2020, 3, document(3), mtime=1_700_000_000)
+    (root / paths['removed']).unlink()
+    added = write(root, 'goa', 2020, 4, document(5))
+
+    changed, removed, touched = diff_manifest(previous, DirectorySource(root), [DATASET])
+
+    assert sorted(row['Path'] for row in changed) == sorted([paths['changed'], added])
+    assert [row['Path'] for row in removed] == [paths['removed']]
+    assert [row['Path'] for row in touched] == [paths['touched']]
+    assert touched[0]['Sha1'] == previous[paths['touched']]['Sha1']
+
+
+def test_files_with_matching_size_and_mtime_are_not_hashed(tree, monkeypatch):
+    root, paths, previous = tree
+    hashed = []
+    original = manifest.file_hash
+    monkeypatch.setattr(manifest, 'file_hash', lambda source, path: hashed.append(path) or original(source, path))
+    write(root, 'goa', 2020, 3, document(3), mtime=1_700_000_000)
+
+    assert diff_manifest(previous, DirectorySource(root), [DATASET])[0] == []
+    assert hashed == [paths['touched']]
+
+
+def test_removed_rows_are_limited_to_the_scanned_datasets(tree):
+    root, _, previous = tree
+    other = {'map_user/goa/2020/1.json': {'Path': 'map_user/goa/2020/1.json', 'Dataset': 'map_user'}}
+
+    _, removed, _ = diff_manifest({**previous, **other}, DirectorySource(root), [DATASET])
+
+    assert removed == []
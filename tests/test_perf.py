@@ -0,0 +1,22 @@
+import time
+import perf
+
+
+def allocate(mb):
+    """Hold `mb` MB of touched pages long enough for the sampler to see them"""
+    block = bytearray(mb * 2**20)
+    block[::4096] = b'1' * len(block[::4096])
+    time.sleep(perf.SAMPLE_INTERVAL * 10)
+
+
+def test_each_span_reports_its_own_peak():
+    with perf.span('test.outer') as outer:
+        with perf.span('test.spike') as spike:
+            allocate(64)
+        with perf.span('test.after') as after:
+            time.sleep(perf.SAMPLE_INTERVAL * 10)
+
+    assert spike['peak_growth_mb'] >= 60 and outer['peak_growth_mb'] >= 60
+    # The spike was freed before this span opened, so it must not inherit that peak
+    assert after['peak_rss_mb'] < spike['peak_rss_mb'] - 50
+    assert abs(after['peak_growth_mb']) < 10
@@ -0,0 +1,47 @@
+import os
+import pytest
+from dashboard.pool import ReadOnlyPool
+from sqlite_store import build_database
+
+TRANSACTIONS = [('Goa', 2021, 1, 'Recharge', 1, 1.0), ('Delhi', 2021, 1, 'Recharge', 2, 2.0)]
+USERS = [('Goa', 2021, 1, 'Xiaomi', 10, 0.5)]
+COUNT = "SELECT COUNT(*) FROM aggregated_transaction"
+
+
+def build(path, transactions):
+    build_database(path, {'aggregated_transaction': transactions, 'aggregated_user': USERS})
+    return path
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ReadOnlyPool(build(tmp_path / 'pulse.db', TRANSACTIONS), size=2)
+    yield pool
+    pool.close()
+
+
+def test_replacing_the_file_changes_only_the_rebuilt_tables_versions(pool, tmp_path):
+    transactions, users = pool.data_version('aggregated_transaction'), pool.data_version('aggregated_user')
+
+    os.replace(build(tmp_path / 'rebuilt.db', TRANSACTIONS[:1]), pool.db_path)
+
+    assert pool.data_version('aggregated_transaction') != transactions
+    assert pool.data_version('aggregated_user') == users
+
+
+def test_idle_connections_to_a_replaced_file_are_closed(pool, tmp_path):
+    with pool.connection() as conn:
+        assert conn.execute(COUNT).fetchone() == (2,)
+
+    os.replace(build(tmp_path / 'rebuilt.db', TRANSACTIONS[:1]), pool.db_path)
+
+    with pool.connection() as fresh:
+        assert fresh is not conn and fresh.execute(COUNT).fetchone() == (1,)
+
+
+def test_queries_running_during_a_swap_finish_on_the_old_file(pool, tmp_path):
+    with pool.connection() as conn:
+        rows = conn.execute("SELECT State FROM aggregated_transaction")
+        os.replace(build(tmp_path / 'rebuilt.db', TRANSACTIONS[:1]), pool.db_path)
+
+        assert len(rows.fetchall()) == 2
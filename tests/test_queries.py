@@ -0,0 +1,97 @@
+import random
+import sqlite3
+import pytest
+from dashboard import queries
+from sqlite_store import build_database
+
+TABLE = 'aggregated_transaction'
+STATES = ['Goa', 'Delhi', 'Kerala', 'Assam', 'Punjab']
+TYPES = ['Recharge', 'Peer-to-peer payments', 'Merchant payments', 'Financial Services', 'Others']
+
+
+@pytest.fixture(scope='module')
+def conn(tmp_path_factory):
+    """Two quarters of rows with many tied counts, so the sort column alone is not a total order"""
+    rng = random.Random(7)
+    rows = [(state, 2021, quarter, kind, rng.choice([0, 5, 10]), float(rng.randrange(100)))
+            for quarter in (1, 2) for state in STATES for kind in TYPES]
+    db_path = tmp_path_factory.mktemp('db') / 'pulse.db'
+    build_database(db_path, {TABLE: rows})
+    conn = sqlite3.connect(db_path)
+    yield conn
+    conn.close()
+
+
+def walk(conn, limit, **options):
+    """Follow Next from the first page to the last; returns every row and the page count"""
+    seen, after, pages = [], None, 0
+    while True:
+        df, after = queries.page(conn, TABLE, after=after, limit=limit, **options)
+        seen.extend(df.itertuples(index=False, name=None))
+        pages += 1
+        if after is None:
+            return seen, pages
+
+
+def expected(conn, sort=None, descending=False, year=None, quarter=None, contains=None):
+    """The same slice in one query, ordered in Python"""
+    df = queries.read_sql(f"SELECT * FROM {TABLE}", conn)
+    if year is not None:
+        df = df[(df['Year'] == year) & (df['Quarter'] == quarter)]
+    for column, text in (contains or {}).items():
+        df = df[df[column].str.contains(text, case=False, regex=False)]
+    order = queries.order_columns(TABLE, sort)
+    return list(df.sort_values(order, ascending=not descending).itertuples(index=False, name=None))
+
+
+@pytest.mark.parametrize('sort', [None, 'Transaction_count', 'Transaction_amount', 'State', 'Transaction_type'])
+@pytest.mark.parametrize('descending', [False, True])
+@pytest.mark.parametrize('limit', [1, 7, 50])
+def test_pages_return_every_row_exactly_once_in_order(conn, sort, descending, limit):
+    rows, pages = walk(conn, limit, sort=sort, descending=descending)
+
+    assert rows == expected(conn, sort, descending)
+    assert pages == -(-len(rows) // limit)
+
+
+@pytest.mark.parametrize('contains', [{'State': 'a'}, {'Transaction_type': 'PAY'}, {'State': '%'}])
+def test_filtered_pages_match_count(conn, contains):
+    options = dict(year=2021, quarter=2, sort='Transaction_count', descending=True, contains=contains)
+    rows, _ = walk(conn, 4, **options)
+
+    assert rows == expected(conn, **options)
+    assert queries.count(conn, TABLE, 2021, 2, contains) == len(rows)
+
+
+def test_cursor_holds_plain_python_values(conn):
+    _, after = queries.page(conn, TABLE, sort='Transaction_amount', limit=3)
+
+    assert [type(value) for value in after] == [float, int, int, int, int]
+    assert queries.page(conn, TABLE, limit=1000)[1] is None
+
+
+def test_breakdown_sums_one_state_and_period(conn):
+    df = queries.breakdown(conn, TABLE, 'Transaction_type', ['Transaction_count', 'Transaction_amount'],
+                           2021, 2, 'Goa', order_by='Transaction_amount', limit=3)
+
+    rows = queries.read_sql(f"SELECT * FROM {TABLE}", conn)
+    goa = rows[(rows['State'] == 'Goa') & (rows['Year'] == 2021) & (rows['Quarter'] == 2)]
+    top = goa.sort_values(['Transaction_amount', 'Transaction_type'], ascending=[False, True]).head(3)
+    assert list(df.itertuples(index=False, name=None)) == list(
+        top[['Transaction_type', 'Transaction_count', 'Transaction_amount']].itertuples(index=False, name=None))
+
+
+@pytest.mark.parametrize('sort', [None, 'Transaction_count', 'Transaction_amount', 'State', 'Transaction_type'])
+@pytest.mark.parametrize('descending', [False, True])
+def test_pages_are_read_in_index_order(conn, sort, descending):
+    _, after = queries.page(conn, TABLE, 2021, 2, sort, descending, limit=3)
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        queries.page(conn, TABLE, 2021, 2, sort, descending, after=after, limit=3)
+    finally:
+        conn.set_trace_callback(None)
+
+    query = next(statement for statement in statements if statement.startswith('SELECT'))
+    plan = ' / '.join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}"))
+    assert 'TEMP B-TREE' not in plan and 'USING COVERING INDEX' in plan, plan
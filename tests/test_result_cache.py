@@ -0,0 +1,79 @@
+import os
+import pickle
+import pytest
+from dashboard.pool import ReadOnlyPool
+from dashboard.result_cache import ResultCache
+from sqlite_store import build_database
+
+TRANSACTIONS = [('Goa', 2021, 1, 'Recharge', 1, 1.0), ('Delhi', 2021, 1, 'Recharge', 2, 2.0)]
+USERS = [('Goa', 2021, 1, 'Xiaomi', 10, 0.5)]
+COUNT = "SELECT COUNT(*) FROM aggregated_transaction"
+BRANDS = "SELECT Brands FROM aggregated_user"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(tmp_path / 'results.db')
+
+
+def test_repeated_hits_return_the_same_object_without_unpickling(cache, monkeypatch):
+    cache.fetch('rows', ('t', 1), 't', 'v1', lambda: {'rows': [1, 2, 3]})
+    loads = []
+    monkeypatch.setattr(pickle, 'loads', lambda *args: loads.append(args))
+
+    first = cache.fetch('rows', ('t', 1), 't', 'v1', lambda: pytest.fail("recomputed"))
+
+    assert first is cache.fetch('rows', ('t', 1), 't', 'v1', lambda: pytest.fail("recomputed"))
+    assert first == {'rows': [1, 2, 3]} and loads == []
+
+
+def test_other_processes_fill_the_memory_layer_from_the_file(cache):
+    cache.fetch('rows', ('t', 1), 't', 'v1', lambda: [1, 2, 3])
+    other = ResultCache(cache.path)
+
+    value = other.fetch('rows', ('t', 1), 't', 'v1', lambda: pytest.fail("recomputed"))
+
+    assert value == [1, 2, 3]
+    assert other.fetch('rows', ('t', 1), 't', 'v1', lambda: pytest.fail("recomputed")) is value
+
+
+def test_memory_layer_is_bounded_and_follows_versions(tmp_path):
+    cache = ResultCache(tmp_path / 'results.db', memory_bytes=2000)
+    for n in range(10):
+        cache.fetch('rows', ('t', n), 't', 'v1', lambda: bytes(500))
+    assert 0 < len(cache._memory) < 10 and cache._memory_used <= 2000
+
+    cache.fetch('rows', ('u', 0), 'u', 'v1', lambda: 'other table')
+    cache.fetch('rows', ('t', 0), 't', 'v2', lambda: 'rebuilt')
+
+    assert {entry[:2] for entry in cache._memory.values()} == {('u', 'v1'), ('t', 'v2')}
+
+
+def build(path, transactions):
+    build_database(path, {'aggregated_transaction': transactions, 'aggregated_user': USERS})
+    return path
+
+
+def cached(cache, pool, table, query):
+    """Result of a query through the cache, keyed on the pool's current version of the table"""
+    def compute():
+        with pool.connection() as conn:
+            return conn.execute(query).fetchall()
+    return cache.fetch(query, (), table, pool.data_version(table), compute)
+
+
+def test_replacing_the_database_drops_only_the_rebuilt_tables_results(cache, tmp_path):
+    pool = ReadOnlyPool(build(tmp_path / 'pulse.db', TRANSACTIONS), size=2)
+    users = pool.data_version('aggregated_user')
+    assert cached(cache, pool, 'aggregated_transaction', COUNT) == [(2,)]
+    cached(cache, pool, 'aggregated_user', BRANDS)
+
+    os.replace(build(tmp_path / 'rebuilt.db', TRANSACTIONS + [('Kerala', 2021, 1, 'Others', 3, 3.0)]),
+               pool.db_path)
+
+    assert cached(cache, pool, 'aggregated_transaction', COUNT) == [(3,)]
+    current = {('aggregated_transaction', pool.data_version('aggregated_transaction')), ('aggregated_user', users)}
+    assert {(table, version) for table, version, _, _ in cache.stats()} == current
+    assert {entry[:2] for entry in cache._memory.values()} == current
+    assert cached(cache, pool, 'aggregated_user', BRANDS) == [('Xiaomi',)]
+    pool.close()
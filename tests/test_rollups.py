@@ -0,0 +1,65 @@
+import sqlite3
+import pytest
+from rollups import refresh_statements
+from sqlite_store import build_database
+
+# Transaction amounts per state and (Year, Quarter). Goa has no 2021 Q1 and no 2021 Q4,
+# so the quarter before 2021 Q2 and the year before 2022 Q1 are both missing for it.
+AMOUNTS = {
+    'Goa': {(2020, 1): 10, (2020, 2): 20, (2020, 3): 30, (2020, 4): 40,
+            (2021, 2): 60, (2021, 3): 90, (2022, 1): 100},
+    'Delhi': {(2020, 1): 5, (2020, 2): 25, (2020, 3): 25},
+}
+
+
+@pytest.fixture(scope='module')
+def conn(tmp_path_factory):
+    rows = [(state, year, quarter, 'Recharge', 1, float(amount))
+            for state, amounts in AMOUNTS.items() for (year, quarter), amount in amounts.items()]
+    db_path = tmp_path_factory.mktemp('db') / 'pulse.db'
+    build_database(db_path, {'aggregated_transaction': rows})
+    conn = sqlite3.connect(db_path)
+    yield conn
+    conn.close()
+
+
+def series(conn, state):
+    """{(Year, Quarter): (QoQ, YoY, Rolling_avg, Position, Position_change)} of one state"""
+    rows = conn.execute("SELECT Year, Quarter, QoQ, YoY, Rolling_avg, Position, Position_change "
+                        "FROM rollup_series WHERE Source = 'aggregated_transaction' "
+                        "AND Measure = 'Transaction_amount' AND Dimension = 'State' AND Member = ?", [state])
+    return {(year, quarter): tuple(values) for year, quarter, *values in rows}
+
+
+def test_growth_is_null_across_a_missing_quarter(conn):
+    goa = series(conn, 'Goa')
+
+    assert goa[2021, 2][0] is None                      # 2021 Q1 is missing
+    assert goa[2021, 2][1] == pytest.approx(60 / 20 - 1)
+    assert goa[2021, 3][0] == pytest.approx(90 / 60 - 1)
+    assert goa[2022, 1][:2] == (None, None)             # 2021 Q4 and 2021 Q1 are missing
+
+
+def test_rolling_average_covers_four_quarters_not_four_rows(conn):
+    goa = series(conn, 'Goa')
+
+    assert goa[2020, 4][2] == pytest.approx((10 + 20 + 30 + 40) / 4)
+    assert goa[2021, 2][2] == pytest.approx((30 + 40 + 60) / 3)
+    assert goa[2022, 1][2] == pytest.approx((60 + 90 + 100) / 3)
+
+
+def test_position_change_is_the_rank_movement_since_the_previous_quarter(conn):
+    goa, delhi = series(conn, 'Goa'), series(conn, 'Delhi')
+
+    assert [goa[2020, quarter][3] for quarter in (1, 2, 3)] == [1, 2, 1]
+    assert [delhi[2020, quarter][3] for quarter in (1, 2, 3)] == [2, 1, 2]
+    assert goa[2020, 1][4] is None
+    assert (goa[2020, 2][4], delhi[2020, 2][4]) == (-1, 1)
+    assert (goa[2020, 3][4], delhi[2020, 3][4]) == (1, -1)
+    assert goa[2021, 2][4] is None
+
+
+def test_refresh_statements_are_dml_only():
+    # MySQL commits implicitly on DDL, so a refresh inside a transaction must not create tables
+    for keyed in (False, True):
+        assert {statement.split()[0] for statement in refresh_statements(keyed=keyed)} == {'DELETE', 'INSERT'}
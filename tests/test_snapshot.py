@@ -0,0 +1,39 @@
+from dashboard.snapshot import read_partition
+from ingestion import to_frame
+from snapshot import KEEP_VERSIONS, SnapshotWriter, write_snapshot
+
+TABLE = 'aggregated_transaction'
+ROWS = [(state, year, quarter, kind, count, count * 1.5)
+        for year in (2021, 2022) for quarter in (1, 2)
+        for count, (state, kind) in enumerate([('Goa', 'Recharge'), ('Goa', 'Others'), ('Delhi', 'Recharge')])]
+
+
+def test_batches_read_back_as_one_partition(tmp_path):
+    writer = SnapshotWriter(tmp_path, 'v1')
+    writer.write(TABLE, to_frame(TABLE, ROWS[:5]))
+    writer.write(TABLE, to_frame(TABLE, ROWS[5:]))
+    writer.commit()
+
+    df = read_partition(tmp_path, 'v1', TABLE, 2021, 2)
+
+    assert list(df.itertuples(index=False, name=None)) == [row for row in ROWS if row[1:3] == (2021, 2)]
+    assert (tmp_path / 'CURRENT').read_text() == 'v1'
+
+
+def test_only_requested_columns_and_partition_are_read(tmp_path):
+    write_snapshot(tmp_path, 'v1', {TABLE: to_frame(TABLE, ROWS)})
+
+    df = read_partition(tmp_path, 'v1', TABLE, 2022, 1, columns=['Transaction_type', 'Quarter'])
+
+    assert list(df.columns) == ['Transaction_type', 'Quarter']
+    assert df.values.tolist() == [['Recharge', 1], ['Others', 1], ['Recharge', 1]]
+    assert read_partition(tmp_path, 'v1', TABLE, 2023, 1) is None
+    assert read_partition(tmp_path, 'v2', TABLE, 2022, 1) is None
+
+
+def test_old_versions_are_pruned(tmp_path):
+    for version in ['v1', 'v2', 'v3']:
+        write_snapshot(tmp_path, version, {TABLE: to_frame(TABLE, ROWS)})
+
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_dir()) == ['v2', 'v3'][-KEEP_VERSIONS:]
+    assert (tmp_path / 'CURRENT').read_text() == 'v3'
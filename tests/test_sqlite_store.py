@@ -0,0 +1,57 @@
+import sqlite3
+import pytest
+from dimensions import DIMENSIONS, keys_out_of_order
+from ingestion import DATASETS
+from sqlite_store import SCHEMA_VERSION, migrate_database, schema_version
+
+# What pandas.to_sql left behind before the store had a schema: every column TEXT, no key
+ROWS = [
+    ('Goa', '2021', '1', 'Recharge', '10', '100.5'),
+    ('Goa', '2021', '1', 'Recharge', '12', '120.0'),       # duplicate key; the last copy wins
+    ('Delhi', '2021', '1', 'Recharge', '7', '70'),
+    ('Delhi', '2021', '1', 'Others', '1', '1.25'),
+    (None, '2021', '1', 'Recharge', '5', '5.0'),            # NULL key columns are dropped
+    ('Assam', '2021', None, 'Recharge', '5', '5.0'),
+    ('Assam', '2021', '2', None, '5', '5.0'),
+]
+
+
+@pytest.fixture
+def version_0(tmp_path):
+    db_path = tmp_path / 'legacy.db'
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE aggregated_transaction (State TEXT, Year TEXT, Quarter TEXT, "
+                 "Transaction_type TEXT, Transaction_count TEXT, Transaction_amount TEXT)")
+    conn.executemany("INSERT INTO aggregated_transaction VALUES (?, ?, ?, ?, ?, ?)", ROWS)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def test_version_0_file_migrates_to_typed_keyed_tables(version_0):
+    assert migrate_database(version_0) == 0
+
+    conn = sqlite3.connect(version_0)
+    assert schema_version(conn) == SCHEMA_VERSION
+    rows = conn.execute("SELECT State, Year, Quarter, Transaction_type, Transaction_count, Transaction_amount, "
+                        "typeof(Year), typeof(Transaction_count), typeof(Transaction_amount) "
+                        "FROM aggregated_transaction ORDER BY State, Transaction_type").fetchall()
+    assert rows == [
+        ('Delhi', 2021, 1, 'Others', 1, 1.25, 'integer', 'integer', 'real'),
+        ('Delhi', 2021, 1, 'Recharge', 7, 70.0, 'integer', 'integer', 'real'),
+        ('Goa', 2021, 1, 'Recharge', 12, 120.0, 'integer', 'integer', 'real'),
+    ]
+    # Tables the old file never had are created empty behind their views
+    for dataset in DATASETS:
+        expected = 3 if dataset == 'aggregated_transaction' else 0
+        assert conn.execute(f"SELECT COUNT(*) FROM {dataset}").fetchone()[0] == expected
+    assert all(keys_out_of_order(conn, column) == 0 for column in DIMENSIONS)
+    assert conn.execute("SELECT Value FROM rollup_cube WHERE Source = 'aggregated_transaction' "
+                        "AND Measure = 'Records' AND Dimension = 'All' AND Year = 0").fetchone() == (3.0,)
+    conn.close()
+
+
+def test_current_file_is_left_alone(version_0):
+    migrate_database(version_0)
+
+    assert migrate_database(version_0) == SCHEMA_VERSION